@@ -91,15 +91,16 @@ async def upload_bundle_release(
             message="Bundle file must use .tar.gz extension",
         )
 
-    file_content = await file.read()
-    if not file_content:
+    magic = await file.read(2)
+    if not magic:
         raise ApiError(status_code=400, code="INVALID_FILE", message="Uploaded file is empty")
-    if len(file_content) < 2 or file_content[:2] != b"\x1f\x8b":
+    if magic != b"\x1f\x8b":
         raise ApiError(
             status_code=400,
             code="INVALID_FILE_TYPE",
             message="Bundle file must be gzip-compressed (.tar.gz)",
         )
+    await file.seek(0)
 
     manifest: dict = {}
     if manifest_json:
@@ -114,7 +115,7 @@ async def upload_bundle_release(
     try:
         release = await upload_and_publish(
             db,
-            file_content=file_content,
+            fileobj=file.file,
             bundle_type=bundle_type,
             scope_id=scope_id,
             version=version,
@@ -144,8 +145,9 @@ def list_bundle_releases(
     return BundleListResponse(bundles=[_to_publish_response(item) for item in releases], total=total)
 
 
-@router.get(
+@router.api_route(
     "/{bundle_id}",
+    methods=["GET", "HEAD"],
     response_model=BundleDetailResponse,
     dependencies=[Depends(require_admin_key)],
 )
@@ -177,24 +179,24 @@ _CHAPTER_SCOPE_RE = re.compile(r"^[A-Za-z0-9_-]+/[A-Za-z0-9_-]+$")
 _UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
 
 
-async def _read_tar_gz(file: UploadFile) -> bytes:
+async def _check_tar_gz(file: UploadFile) -> None:
     filename = (file.filename or "").lower()
     if not filename.endswith(".tar.gz"):
         raise ApiError(status_code=400, code="INVALID_FILE_TYPE", message="Bundle file must use .tar.gz extension")
-    content = await file.read()
-    if not content:
+    magic = await file.read(2)
+    if not magic:
         raise ApiError(status_code=400, code="INVALID_FILE", message="Uploaded file is empty")
-    if len(content) < 2 or content[:2] != b"\x1f\x8b":
+    if magic != b"\x1f\x8b":
         raise ApiError(status_code=400, code="INVALID_FILE_TYPE", message="Bundle file must be gzip-compressed")
-    return content
+    await file.seek(0)
 
 
 async def _do_upload(db: Session, *, file: UploadFile, bundle_type: str, scope_id: str, version: str, is_mandatory: bool) -> BundlePublishResponse:
-    content = await _read_tar_gz(file)
+    await _check_tar_gz(file)
     try:
         release = await upload_and_publish(
             db,
-            file_content=content,
+            fileobj=file.file,
             bundle_type=bundle_type,
             scope_id=scope_id,
             version=version,
@@ -1,10 +1,11 @@
 """Invite code endpoints: admin batch generation, user self-generation, admin listing."""
 
-import random
 import string
+import uuid
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, select
+from sqlalchemy import Integer, cast, func, literal, select, true
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
 from sqlalchemy.orm import Session
 from starlette import status
 
@@ -23,25 +24,41 @@ from app.schemas.invite import (
 router = APIRouter(prefix="/v1", tags=["invite"])
 
 
-def _generate_code() -> str:
-    """Generate a short uppercase alphanumeric invite code."""
-    chars = string.ascii_uppercase + string.digits
-    return "".join(random.choices(chars, k=8))
+_CODE_ALPHABET = string.ascii_uppercase + string.digits
+_CODE_LENGTH = 8
+_MAX_GENERATE_ROUNDS = 5
 
 
-def _generate_unique_codes(db: Session, count: int, created_by: str | None = None) -> list[str]:
-    """Generate `count` unique invite codes and insert them."""
+def _insert_random_codes(db: Session, count: int, created_by: uuid.UUID | None) -> list[str]:
+    """Insert up to `count` random codes in one statement; collisions are skipped."""
+    rows = func.generate_series(1, count).table_valued("i").render_derived(name="g")
+    positions = func.generate_series(1, _CODE_LENGTH).table_valued("j").render_derived(name="p")
+    char = func.substr(_CODE_ALPHABET, 1 + cast(func.floor(func.random() * len(_CODE_ALPHABET)), Integer), 1)
+    candidates = (
+        select(
+            func.gen_random_uuid().label("id"),
+            func.string_agg(char, "").label("code"),
+            literal(created_by, UUID(as_uuid=True)).label("created_by_user_id"),
+        )
+        .select_from(rows.join(positions, true()))
+        .group_by(rows.c.i)
+    )
+    stmt = (
+        pg_insert(InviteCode)
+        .from_select(["id", "code", "created_by_user_id"], candidates)
+        .on_conflict_do_nothing(index_elements=[InviteCode.code])
+        .returning(InviteCode.code)
+    )
+    return list(db.execute(stmt).scalars().all())
+
+
+def _generate_unique_codes(db: Session, count: int, created_by: uuid.UUID | None = None) -> list[str]:
+    """Generate `count` unique invite codes server-side and insert them."""
     codes: list[str] = []
-    attempts = 0
-    while len(codes) < count and attempts < count * 3:
-        attempts += 1
-        code = _generate_code()
-        exists = db.execute(select(InviteCode.id).where(InviteCode.code == code)).scalar_one_or_none()
-        if exists:
-            continue
-        row = InviteCode(code=code, created_by_user_id=created_by)
-        db.add(row)
-        codes.append(code)
+    rounds = 0
+    while len(codes) < count and rounds < _MAX_GENERATE_ROUNDS:
+        rounds += 1
+        codes.extend(_insert_random_codes(db, count - len(codes), created_by))
     db.commit()
     return codes
 
@@ -120,5 +137,5 @@ def user_generate_invite_code(
     db: Session = Depends(get_db),
 ) -> UserInviteCodeResponse:
     """Authenticated user: generate one invite code to share."""
-    codes = _generate_unique_codes(db, 1, created_by=str(current_user.id))
+    codes = _generate_unique_codes(db, 1, created_by=current_user.id)
     return UserInviteCodeResponse(code=codes[0])
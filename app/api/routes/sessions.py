@@ -2,8 +2,9 @@
 
 import uuid
 from datetime import datetime, timezone
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Path, Query
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
@@ -21,6 +22,7 @@ from app.models import (
 )
 from app.schemas.sessions import (
     AppendTurnRequest,
+    BulkSyncRequest,
     ChapterFileItem,
     ChapterFilesResponse,
     ChapterSessionsResponse,
@@ -48,12 +50,12 @@ router = APIRouter(prefix="/v1", tags=["sessions"])
 
 @router.post("/chapters/{chapter_id:path}/sessions", response_model=CreateSessionResponse, status_code=201)
 def create_session(
-    chapter_id: str,
+    chapter_id: Annotated[str, Path(max_length=128)],
     payload: CreateSessionRequest,
     current_user: CurrentUser,
     db: Session = Depends(get_db),
 ) -> CreateSessionResponse:
-    session_id = uuid.uuid4().hex
+    session_id = uuid.uuid4()
     now = datetime.now(timezone.utc)
     row = LearningSession(
         session_id=session_id,
@@ -66,7 +68,7 @@ def create_session(
     )
     db.add(row)
     db.commit()
-    return CreateSessionResponse(session_id=session_id, created_at=now)
+    return CreateSessionResponse(session_id=session_id.hex, created_at=now)
 
 
 # ── List sessions for a chapter ───────────────────────────────────────────────
@@ -101,7 +103,7 @@ def list_chapter_sessions(
         ).scalar() or 0
 
         items.append(SessionSummaryItem(
-            session_id=s.session_id,
+            session_id=s.session_id.hex,
             created_at=s.created_at,
             last_active_at=s.last_active_at,
             turn_count=turn_count,
@@ -141,7 +143,7 @@ def get_session_state_by_id(
 
     return SessionStateResponse(
         has_data=True,
-        session_id=session.session_id,
+        session_id=session.session_id.hex,
         turns=[
             TurnRecord(
                 turn_index=t.turn_index,
@@ -167,28 +169,19 @@ def append_turn(
     current_user: CurrentUser,
     db: Session = Depends(get_db),
 ) -> dict:
-    _require_session_owner(db, session_id, current_user.id)
+    session_row = _require_session_owner(db, session_id, current_user.id)
+    _lock_session(db, session_row)
 
     existing = db.execute(
         select(SessionTurnHistory).where(
-            SessionTurnHistory.session_id == session_id,
+            SessionTurnHistory.session_id == session_row.session_id,
             SessionTurnHistory.turn_index == payload.turn_index,
         )
     ).scalars().first()
 
     if not existing:
-        row = SessionTurnHistory(
-            user_id=current_user.id,
-            session_id=session_id,
-            chapter_id=payload.chapter_id,
-            turn_index=payload.turn_index,
-            user_message=payload.user_message,
-            companion_response=payload.companion_response,
-            turn_outcome=payload.turn_outcome,
-        )
-        db.add(row)
+        db.add(_turn_row(session_row, current_user.id, payload))
 
-    session_row = db.get(LearningSession, session_id)
     session_row.last_active_at = datetime.now(timezone.utc)
     db.commit()
     return {"accepted": True}
@@ -203,28 +196,8 @@ def upsert_memory(
     current_user: CurrentUser,
     db: Session = Depends(get_db),
 ) -> dict:
-    _require_session_owner(db, session_id, current_user.id)
-
-    row = db.execute(
-        select(SessionMemoryState).where(SessionMemoryState.session_id == session_id)
-    ).scalars().first()
-
-    if row:
-        row.memory_json = payload.memory_json
-        if payload.agent_state is not None:
-            row.agent_state_json = payload.agent_state
-        row.updated_at = datetime.now(timezone.utc)
-    else:
-        row = SessionMemoryState(
-            user_id=current_user.id,
-            session_id=session_id,
-            chapter_id=payload.chapter_id,
-            memory_json=payload.memory_json,
-            agent_state_json=payload.agent_state,
-            updated_at=datetime.now(timezone.utc),
-        )
-        db.add(row)
-
+    session = _require_session_owner(db, session_id, current_user.id)
+    _upsert_memory_row(db, session, current_user.id, payload)
     db.commit()
     return {"accepted": True}
 
@@ -238,24 +211,49 @@ def upsert_report(
     current_user: CurrentUser,
     db: Session = Depends(get_db),
 ) -> dict:
-    _require_session_owner(db, session_id, current_user.id)
+    session = _require_session_owner(db, session_id, current_user.id)
+    _upsert_report_row(db, session, current_user.id, payload)
+    db.commit()
+    return {"accepted": True}
 
-    row = db.execute(
-        select(SessionDynamicReport).where(SessionDynamicReport.session_id == session_id)
-    ).scalars().first()
 
-    if row:
-        row.report_md = payload.report_md
-        row.updated_at = datetime.now(timezone.utc)
-    else:
-        row = SessionDynamicReport(
-            user_id=current_user.id,
-            session_id=session_id,
-            chapter_id=payload.chapter_id,
-            report_md=payload.report_md,
-            updated_at=datetime.now(timezone.utc),
+# ── Bulk sync ─────────────────────────────────────────────────────────────────
+
+@router.post("/sessions/{session_id}/bulk-sync", status_code=200)
+def bulk_sync(
+    session_id: str,
+    payload: BulkSyncRequest,
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+) -> dict:
+    """Turns, memory and report in one request and one transaction.
+
+    Same semantics as the per-resource endpoints: a turn_index that is already
+    stored (or repeated in the batch) keeps its first version.
+    """
+    session_row = _require_session_owner(db, session_id, current_user.id)
+
+    if payload.turns:
+        _lock_session(db, session_row)
+        seen = set(
+            db.execute(
+                select(SessionTurnHistory.turn_index).where(
+                    SessionTurnHistory.session_id == session_row.session_id,
+                    SessionTurnHistory.turn_index.in_({t.turn_index for t in payload.turns}),
+                )
+            ).scalars()
         )
-        db.add(row)
+        for turn in payload.turns:
+            if turn.turn_index in seen:
+                continue
+            seen.add(turn.turn_index)
+            db.add(_turn_row(session_row, current_user.id, turn))
+        session_row.last_active_at = datetime.now(timezone.utc)
+
+    if payload.memory is not None:
+        _upsert_memory_row(db, session_row, current_user.id, payload.memory)
+    if payload.report is not None:
+        _upsert_report_row(db, session_row, current_user.id, payload.report)
 
     db.commit()
     return {"accepted": True}
@@ -306,7 +304,7 @@ def get_session_state(
 
     return SessionStateResponse(
         has_data=True,
-        session_id=session.session_id,
+        session_id=session.session_id.hex,
         turns=[
             TurnRecord(
                 turn_index=t.turn_index,
@@ -527,7 +525,11 @@ def delete_chapter_file(
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 def _require_session_owner(db: Session, session_id: str, user_id: uuid.UUID) -> LearningSession:
-    session = db.get(LearningSession, session_id)
+    try:
+        key = uuid.UUID(session_id)
+    except ValueError:
+        key = None
+    session = db.get(LearningSession, key) if key else None
     if not session:
         raise ApiError(status_code=404, code=ErrorCode.SESSION_NOT_FOUND, message="Session not found")
     if session.user_id != user_id:
@@ -535,6 +537,68 @@ def _require_session_owner(db: Session, session_id: str, user_id: uuid.UUID) ->
     return session
 
 
+def _lock_session(db: Session, session: LearningSession) -> None:
+    # Serialize turn appends per session so a retried turn arriving while the
+    # original is still in flight sees it and is accepted as a no-op, instead of
+    # tripping the table's duplicate-turn trigger.
+    db.execute(
+        select(LearningSession.session_id).where(LearningSession.session_id == session.session_id).with_for_update()
+    ).scalar_one()
+
+
+def _turn_row(session: LearningSession, user_id: uuid.UUID, payload: AppendTurnRequest) -> SessionTurnHistory:
+    return SessionTurnHistory(
+        user_id=user_id,
+        session_id=session.session_id,
+        chapter_id=payload.chapter_id,
+        turn_index=payload.turn_index,
+        user_message=payload.user_message,
+        companion_response=payload.companion_response,
+        turn_outcome=payload.turn_outcome,
+    )
+
+
+def _upsert_memory_row(db: Session, session: LearningSession, user_id: uuid.UUID, payload: UpsertMemoryRequest) -> None:
+    row = db.execute(
+        select(SessionMemoryState).where(SessionMemoryState.session_id == session.session_id)
+    ).scalars().first()
+
+    if row:
+        row.memory_json = payload.memory_json
+        if payload.agent_state is not None:
+            row.agent_state_json = payload.agent_state
+        row.updated_at = datetime.now(timezone.utc)
+    else:
+        row = SessionMemoryState(
+            user_id=user_id,
+            session_id=session.session_id,
+            chapter_id=payload.chapter_id,
+            memory_json=payload.memory_json,
+            agent_state_json=payload.agent_state,
+            updated_at=datetime.now(timezone.utc),
+        )
+        db.add(row)
+
+
+def _upsert_report_row(db: Session, session: LearningSession, user_id: uuid.UUID, payload: UpsertReportRequest) -> None:
+    row = db.execute(
+        select(SessionDynamicReport).where(SessionDynamicReport.session_id == session.session_id)
+    ).scalars().first()
+
+    if row:
+        row.report_md = payload.report_md
+        row.updated_at = datetime.now(timezone.utc)
+    else:
+        row = SessionDynamicReport(
+            user_id=user_id,
+            session_id=session.session_id,
+            chapter_id=payload.chapter_id,
+            report_md=payload.report_md,
+            updated_at=datetime.now(timezone.utc),
+        )
+        db.add(row)
+
+
 def _quota_used(db: Session, user_id: uuid.UUID) -> int:
     result = db.execute(
         select(func.coalesce(func.sum(UserSubmittedFile.file_size_bytes), 0)).where(
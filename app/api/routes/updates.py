@@ -7,7 +7,16 @@ from app.core.error_codes import ErrorCode
 from app.core.errors import ApiError
 from app.db.session import get_db
 from app.models import BundleRelease, CourseChapter, Enrollment
-from app.schemas.updates import CheckAppRequest, CheckAppResponse, CheckChapterRequest, CheckChapterResolved, CheckChapterResponse, RuntimeConfigResponse
+from app.schemas.updates import (
+    CheckAllRequest,
+    CheckAllResponse,
+    CheckAppRequest,
+    CheckAppResponse,
+    CheckChapterRequest,
+    CheckChapterResolved,
+    CheckChapterResponse,
+    RuntimeConfigResponse,
+)
 from app.services.update_service import check_bundle_required, latest_bundle_release
 
 router = APIRouter(prefix="/v1/updates", tags=["updates"])
@@ -112,7 +121,7 @@ def check_chapter_updates(
     required = []
     # Use chapter UUID as scope for bundle lookup
     chapter_scope = str(chapter.id)
-    chapter_release = latest_bundle_release(db, bundle_type="chapter", scope_id=chapter_scope)
+    chapter_release = latest_bundle_release(db, bundle_type="chapter", scope_id=chapter_scope, with_manifest=True)
     chapter_required = check_bundle_required(payload.installed.chapter_bundle, chapter_release)
     if chapter_required:
         required.append(chapter_required)
@@ -140,6 +149,17 @@ def check_chapter_updates(
     )
 
 
+@router.post("/check-all", response_model=CheckAllResponse)
+def check_all_updates(
+    payload: CheckAllRequest,
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+) -> CheckAllResponse:
+    """check-app and (optionally) check-chapter in one round trip."""
+    chapter = check_chapter_updates(payload.chapter, current_user, db) if payload.chapter else None
+    return CheckAllResponse(app=check_app_updates(payload.app, current_user, db), chapter=chapter)
+
+
 # Miniconda platform scope → installer filename on Tsinghua mirror
 _CONDA_BASE = "https://mirrors.tuna.tsinghua.edu.cn/anaconda/miniconda/"
 _CONDA_FILENAMES: dict[str, str] = {
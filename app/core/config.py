@@ -35,6 +35,9 @@ class Settings(BaseSettings):
     waitlist_max_per_email_window: int = 3
     waitlist_cooldown_seconds: int = 60
 
+    auth_rate_limit_retention_seconds: int = 24 * 3600
+    auth_rate_limit_gc_interval_seconds: int = 3600  # 0 disables the in-process purge loop
+
     seed_data: bool = True
     admin_api_key: str = ""
 
@@ -44,6 +47,8 @@ class Settings(BaseSettings):
     oss_endpoint: str = ""
     oss_bucket_name: str = ""
     oss_cdn_domain: str = ""
+    oss_cdn_auth_key: str = ""  # CDN URL authentication (type A) primary key; enables CDN-signed downloads
+    oss_cdn_auth_ttl_seconds: int = 1800  # must match the validity period configured on the CDN domain
     oss_access_key_id: str = ""
     oss_access_key_secret: str = ""
     oss_role_arn: str = ""
@@ -1,3 +1,5 @@
+import asyncio
+import logging
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -13,8 +15,14 @@ from app.core.errors import ApiError
 from app.db.seed import seed_if_needed
 from app.db.session import SessionLocal
 from app.services.oss import oss_service
+from app.services.rate_limit import purge_expired_events
+from app.services.session_history import ensure_turn_history_partitions
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Upcoming partitions are created months ahead, so a daily check is plenty.
+_TURN_PARTITION_CHECK_SECONDS = 24 * 3600
 
 app = FastAPI(title=settings.app_name, version="0.1.0")
 
@@ -57,6 +65,65 @@ def on_startup() -> None:
             raise RuntimeError("Database schema is not ready. Run: alembic upgrade head") from exc
 
 
+def _purge_rate_limit_events() -> int:
+    with SessionLocal() as db:
+        return purge_expired_events(db)
+
+
+async def _rate_limit_gc_loop(interval: int) -> None:
+    while True:
+        try:
+            deleted = await asyncio.to_thread(_purge_rate_limit_events)
+            if deleted:
+                logger.info("Purged %d expired rate-limit events", deleted)
+        except Exception:
+            # Keep the loop alive on any failure; the next pass retries.
+            logger.exception("Failed to purge expired rate-limit events")
+        await asyncio.sleep(interval)
+
+
+@app.on_event("startup")
+async def start_rate_limit_gc() -> None:
+    if settings.auth_rate_limit_gc_interval_seconds > 0:
+        app.state.rate_limit_gc = asyncio.create_task(_rate_limit_gc_loop(settings.auth_rate_limit_gc_interval_seconds))
+
+
+@app.on_event("shutdown")
+async def stop_rate_limit_gc() -> None:
+    task = getattr(app.state, "rate_limit_gc", None)
+    if task:
+        task.cancel()
+
+
+def _ensure_turn_history_partitions() -> int:
+    with SessionLocal() as db:
+        return ensure_turn_history_partitions(db)
+
+
+async def _turn_partition_loop() -> None:
+    while True:
+        try:
+            created = await asyncio.to_thread(_ensure_turn_history_partitions)
+            if created:
+                logger.info("Created %d session_turn_history partitions", created)
+        except Exception:
+            # Keep the loop alive on any failure; the next pass retries.
+            logger.exception("Failed to create session_turn_history partitions")
+        await asyncio.sleep(_TURN_PARTITION_CHECK_SECONDS)
+
+
+@app.on_event("startup")
+async def start_turn_partition_maintenance() -> None:
+    app.state.turn_partitions = asyncio.create_task(_turn_partition_loop())
+
+
+@app.on_event("shutdown")
+async def stop_turn_partition_maintenance() -> None:
+    task = getattr(app.state, "turn_partitions", None)
+    if task:
+        task.cancel()
+
+
 app.include_router(auth.router)
 app.include_router(me.router)
 app.include_router(courses.router)
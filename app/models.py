@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -12,7 +12,7 @@ class User(Base):
     __tablename__ = "users"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
+    email: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
     display_name: Mapped[str] = mapped_column(String(120), nullable=False)
     password_hash: Mapped[str | None] = mapped_column(String(255), nullable=True)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="active")
@@ -26,7 +26,7 @@ class EmailVerificationCode(Base):
     __tablename__ = "email_verification_codes"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    email: Mapped[str] = mapped_column(Text, index=True, nullable=False)
     purpose: Mapped[str] = mapped_column(String(32), nullable=False)
     code_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -52,7 +52,7 @@ class Course(Base):
     __tablename__ = "courses"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    course_code: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    course_code: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False, default="")
     instructor: Mapped[str] = mapped_column(String(120), nullable=False, default="")
@@ -62,7 +62,7 @@ class Course(Base):
     overview_necessity: Mapped[str] = mapped_column(Text, nullable=False, default="")
     overview_journey: Mapped[str] = mapped_column(Text, nullable=False, default="")
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
-    invite_code: Mapped[str | None] = mapped_column(String(8), unique=True, index=True, nullable=True)
+    invite_code: Mapped[str | None] = mapped_column(Text, unique=True, nullable=True)
     is_public: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
     parts: Mapped[list | None] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -102,7 +102,7 @@ class ChapterProgress(Base):
     course_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False, index=True)
     chapter_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("course_chapters.id"), nullable=False, index=True)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="IN_PROGRESS")
-    last_session_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_session_id: Mapped[str | None] = mapped_column(Text, nullable=True)
     task_snapshot: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
@@ -111,11 +111,14 @@ class ChapterProgress(Base):
 
 class BundleRelease(Base):
     __tablename__ = "bundle_releases"
-    __table_args__ = (UniqueConstraint("bundle_type", "scope_id", "version", name="uq_bundle_release"),)
+    __table_args__ = (
+        UniqueConstraint("bundle_type", "scope_id", "version", name="uq_bundle_release"),
+        Index("ix_bundle_releases_btype_scope_created", "bundle_type", "scope_id", text("created_at DESC")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    bundle_type: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
-    scope_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    bundle_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    scope_id: Mapped[str] = mapped_column(String(255), nullable=False)
     version: Mapped[str] = mapped_column(String(64), nullable=False)
     manifest_json: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     artifact_url: Mapped[str] = mapped_column(Text, nullable=False)
@@ -125,15 +128,26 @@ class BundleRelease(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 
+class BundleReleaseLatest(Base):
+    """Pointer to the newest BundleRelease per scope, maintained by a DB trigger."""
+
+    __tablename__ = "bundle_releases_latest"
+
+    bundle_type: Mapped[str] = mapped_column(String(64), primary_key=True)
+    scope_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    release_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 class AnalyticsEvent(Base):
     __tablename__ = "analytics_events"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    event_id: Mapped[str | None] = mapped_column(String(128), nullable=True, unique=True, index=True)
+    event_id: Mapped[str | None] = mapped_column(String(128), nullable=True, unique=True)
     user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
-    course_id: Mapped[str | None] = mapped_column(String(128), nullable=True, index=True)
-    chapter_id: Mapped[str | None] = mapped_column(String(128), nullable=True, index=True)
-    session_id: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    course_id: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
+    chapter_id: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
+    session_id: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
     event_type: Mapped[str] = mapped_column(String(128), nullable=False)
     event_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     payload_json: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
@@ -142,47 +156,64 @@ class AnalyticsEvent(Base):
 
 class AuthRateLimitEvent(Base):
     __tablename__ = "auth_rate_limit_events"
+    __table_args__ = (
+        Index("ix_auth_rate_limit_events_action_identifier_created", "action", "identifier", "created_at"),
+        Index("ix_auth_rate_limit_events_created_at_brin", "created_at", postgresql_using="brin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    action: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
-    identifier: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    action: Mapped[str] = mapped_column(String(64), nullable=False)
+    identifier: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 
 class LearningSession(Base):
     __tablename__ = "learning_sessions"
+    __table_args__ = (
+        Index("ix_learning_sessions_user_chapter_last_active", "user_id", "chapter_id", text("last_active_at DESC")),
+    )
 
-    session_id: Mapped[str] = mapped_column(String(64), primary_key=True)
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    chapter_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
-    course_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
-    bundle_version: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()")
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    chapter_id: Mapped[str] = mapped_column(Text, nullable=False, index=True)
+    course_id: Mapped[str | None] = mapped_column(Text, nullable=True)
+    bundle_version: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     last_active_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
 class SessionTurnHistory(Base):
     __tablename__ = "session_turn_history"
-    __table_args__ = (UniqueConstraint("session_id", "turn_index", name="uq_turn_session_index"),)
+    # Monthly RANGE partitions on created_at (see migration 20261016_0023); the
+    # partition key must be part of every unique constraint, so (session_id,
+    # turn_index) uniqueness is enforced by a trigger in that migration.
+    __table_args__ = (
+        UniqueConstraint("session_id", "turn_index", "created_at", name="uq_turn_session_index"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    session_id: Mapped[str] = mapped_column(String(64), ForeignKey("learning_sessions.session_id"), nullable=False, index=True)
-    chapter_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("learning_sessions.session_id"), nullable=False)
+    chapter_id: Mapped[str] = mapped_column(Text, nullable=False)
     turn_index: Mapped[int] = mapped_column(Integer, nullable=False)
     user_message: Mapped[str] = mapped_column(Text, nullable=False)
     companion_response: Mapped[str] = mapped_column(Text, nullable=False)
     turn_outcome: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
+    )
 
 
 class SessionMemoryState(Base):
     __tablename__ = "session_memory_state"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    session_id: Mapped[str] = mapped_column(String(64), ForeignKey("learning_sessions.session_id"), nullable=False, unique=True)
-    chapter_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("learning_sessions.session_id"), nullable=False, unique=True)
+    chapter_id: Mapped[str] = mapped_column(Text, nullable=False)
     memory_json: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     agent_state_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -192,23 +223,26 @@ class SessionDynamicReport(Base):
     __tablename__ = "session_dynamic_report"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    session_id: Mapped[str] = mapped_column(String(64), ForeignKey("learning_sessions.session_id"), nullable=False, unique=True)
-    chapter_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("learning_sessions.session_id"), nullable=False, unique=True)
+    chapter_id: Mapped[str] = mapped_column(Text, nullable=False)
     report_md: Mapped[str] = mapped_column(Text, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
 class UserSubmittedFile(Base):
     __tablename__ = "user_submitted_files"
-    __table_args__ = (UniqueConstraint("user_id", "chapter_id", "filename", name="uq_user_chapter_filename"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "chapter_id", "filename", name="uq_user_chapter_filename"),
+        Index("ix_user_submitted_files_user_submitted", "user_id", text("submitted_at DESC")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    session_id: Mapped[str] = mapped_column(String(64), nullable=False)
-    chapter_id: Mapped[str] = mapped_column(String(128), nullable=False)
-    filename: Mapped[str] = mapped_column(String(255), nullable=False)
-    oss_key: Mapped[str] = mapped_column(String(500), nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    session_id: Mapped[str] = mapped_column(Text, nullable=False)
+    chapter_id: Mapped[str] = mapped_column(Text, nullable=False)
+    filename: Mapped[str] = mapped_column(Text, nullable=False)
+    oss_key: Mapped[str] = mapped_column(Text, nullable=False)
     file_size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
     submitted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -219,12 +253,12 @@ class BugReport(Base):
     __tablename__ = "bug_reports"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    bug_id: Mapped[str] = mapped_column(String(16), unique=True, index=True, nullable=False)
+    bug_id: Mapped[str] = mapped_column(Text, unique=True, index=True, nullable=False)
     user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
-    oss_key: Mapped[str] = mapped_column(String(500), nullable=False)
+    oss_key: Mapped[str] = mapped_column(Text, nullable=False)
     file_size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
-    app_version: Mapped[str] = mapped_column(String(64), nullable=False, default="")
-    platform: Mapped[str] = mapped_column(String(64), nullable=False, default="")
+    app_version: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    platform: Mapped[str] = mapped_column(Text, nullable=False, default="")
     description: Mapped[str] = mapped_column(Text, nullable=False, default="")
     metadata_json: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -234,7 +268,7 @@ class InviteCode(Base):
     __tablename__ = "invite_codes"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    code: Mapped[str] = mapped_column(String(32), unique=True, index=True, nullable=False)
+    code: Mapped[str] = mapped_column(Text, unique=True, index=True, nullable=False)
     created_by_user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     used_by_user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -245,5 +279,5 @@ class WaitlistEntry(Base):
     __tablename__ = "waitlist_entries"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
+    email: Mapped[str] = mapped_column(Text, unique=True, index=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
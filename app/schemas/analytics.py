@@ -7,9 +7,9 @@ class AnalyticsEventIn(BaseModel):
     event_id: str | None = Field(default=None, max_length=128)
     event_type: str = Field(min_length=1, max_length=128)
     event_time: datetime
-    course_id: str | None = None
-    chapter_id: str | None = None
-    session_id: str | None = None
+    course_id: str | None = Field(default=None, max_length=128)
+    chapter_id: str | None = Field(default=None, max_length=128)
+    session_id: str | None = Field(default=None, max_length=255)
     payload: dict = {}
 
 
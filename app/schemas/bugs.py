@@ -16,11 +16,11 @@ class BugReportUrlResponse(BaseModel):
 
 
 class BugReportConfirmRequest(BaseModel):
-    bug_id: str
-    oss_key: str
+    bug_id: str = Field(max_length=16)
+    oss_key: str = Field(max_length=500)
     file_size_bytes: int = Field(gt=0)
-    app_version: str = ""
-    platform: str = ""
+    app_version: str = Field(default="", max_length=64)
+    platform: str = Field(default="", max_length=64)
     description: str = ""
     metadata: dict[str, Any] = {}
 
@@ -5,7 +5,7 @@ from pydantic import BaseModel, Field
 class ChapterProgressRequest(BaseModel):
     course_id: str
     chapter_id: str
-    session_id: str | None = None
+    session_id: str | None = Field(default=None, max_length=255)
     status: str = Field(pattern="^(NOT_STARTED|IN_PROGRESS|COMPLETED)$")
     task_snapshot: dict = {}
 
@@ -8,8 +8,8 @@ from pydantic import BaseModel, Field, field_validator
 # ── Session registration ──────────────────────────────────────────────────────
 
 class CreateSessionRequest(BaseModel):
-    course_id: str | None = None
-    bundle_version: str | None = None
+    course_id: str | None = Field(default=None, max_length=128)
+    bundle_version: str | None = Field(default=None, max_length=32)
 
 
 class CreateSessionResponse(BaseModel):
@@ -20,7 +20,7 @@ class CreateSessionResponse(BaseModel):
 # ── Turn append ───────────────────────────────────────────────────────────────
 
 class AppendTurnRequest(BaseModel):
-    chapter_id: str
+    chapter_id: str = Field(max_length=128)
     turn_index: int
     user_message: str
     companion_response: str
@@ -30,7 +30,7 @@ class AppendTurnRequest(BaseModel):
 # ── Memory upsert ─────────────────────────────────────────────────────────────
 
 class UpsertMemoryRequest(BaseModel):
-    chapter_id: str
+    chapter_id: str = Field(max_length=128)
     memory_json: dict[str, Any]
     agent_state: dict[str, Any] | None = None
 
@@ -38,10 +38,18 @@ class UpsertMemoryRequest(BaseModel):
 # ── Report upsert ─────────────────────────────────────────────────────────────
 
 class UpsertReportRequest(BaseModel):
-    chapter_id: str
+    chapter_id: str = Field(max_length=128)
     report_md: str
 
 
+# ── Bulk sync ─────────────────────────────────────────────────────────────────
+
+class BulkSyncRequest(BaseModel):
+    turns: list[AppendTurnRequest] = []
+    memory: UpsertMemoryRequest | None = None
+    report: UpsertReportRequest | None = None
+
+
 # ── Recovery fetch ────────────────────────────────────────────────────────────
 
 class TurnRecord(BaseModel):
@@ -91,8 +99,8 @@ def _validate_workspace_filename(value: str) -> str:
 
 
 class UploadUrlRequest(BaseModel):
-    chapter_id: str
-    filename: str
+    chapter_id: str = Field(max_length=128)
+    filename: str = Field(max_length=255)
     file_size_bytes: int = Field(gt=0)
 
     @field_validator("filename")
@@ -108,11 +116,11 @@ class UploadUrlResponse(BaseModel):
 
 
 class ConfirmUploadRequest(BaseModel):
-    oss_key: str
-    filename: str
-    chapter_id: str
+    oss_key: str = Field(max_length=500)
+    filename: str = Field(max_length=255)
+    chapter_id: str = Field(max_length=128)
     file_size_bytes: int = Field(gt=0)
-    session_id: str = ""
+    session_id: str = Field(default="", max_length=64)
 
     @field_validator("filename")
     @classmethod
@@ -45,6 +45,16 @@ class CheckChapterResponse(BaseModel):
     resolved_chapter: CheckChapterResolved
 
 
+class CheckAllRequest(BaseModel):
+    app: CheckAppRequest
+    chapter: CheckChapterRequest | None = None
+
+
+class CheckAllResponse(BaseModel):
+    app: CheckAppResponse
+    chapter: CheckChapterResponse | None = None
+
+
 class RuntimeConfigResponse(BaseModel):
     conda_installer_url: str
     pip_index_url: str
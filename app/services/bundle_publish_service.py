@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
+from typing import BinaryIO
 from uuid import UUID
 
 from sqlalchemy import func, select
@@ -13,6 +15,9 @@ from app.schemas.admin_bundles import BundlePublishRequest
 from app.services.oss import oss_service
 
 
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
 def _raise_conflict() -> None:
     raise ApiError(status_code=409, code="BUNDLE_RELEASE_CONFLICT", message="Bundle release already exists")
 
@@ -49,18 +54,29 @@ def publish_bundle(db: Session, request: BundlePublishRequest) -> BundleRelease:
     return release
 
 
+def _digest_stream(fileobj: BinaryIO) -> tuple[str, int]:
+    """Return (sha256 hex, size) of a seekable stream and rewind it."""
+    hasher = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    while chunk := fileobj.read(_HASH_CHUNK_SIZE):
+        hasher.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return hasher.hexdigest(), size
+
+
 async def upload_and_publish(
     db: Session,
     *,
-    file_content: bytes,
+    fileobj: BinaryIO,
     bundle_type: str,
     scope_id: str,
     version: str,
     is_mandatory: bool = True,
     manifest_json: dict | None = None,
 ) -> BundleRelease:
-    sha256 = hashlib.sha256(file_content).hexdigest()
-    size_bytes = len(file_content)
+    sha256, size_bytes = await asyncio.to_thread(_digest_stream, fileobj)
     artifact_url: str | None = None
     request = BundlePublishRequest(
         bundle_type=bundle_type,
@@ -92,7 +108,8 @@ async def upload_and_publish(
 
     try:
         artifact_url = await oss_service.upload_bundle(
-            file_content=file_content,
+            fileobj=fileobj,
+            size=size_bytes,
             bundle_type=bundle_type,
             scope_id=scope_id,
             version=version,
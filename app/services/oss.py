@@ -4,25 +4,71 @@ Alibaba Cloud OSS service helpers for bundle delivery.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+from collections import OrderedDict
 from datetime import datetime, timezone
+from functools import lru_cache
 import json
-from pathlib import Path, PurePosixPath
-from typing import Any
-from urllib.parse import urlparse
+import threading
+import time
+from pathlib import Path
+import shutil
+from typing import Any, BinaryIO
+from urllib.parse import quote, urlparse
 import uuid
 
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+_SIGNED_URL_CACHE_MAXSIZE = 4096
+_OSS_CONNECTION_POOL_SIZE = 32
+_MULTIPART_THRESHOLD = 16 * 1024 * 1024
+_MULTIPART_PART_SIZE = 8 * 1024 * 1024
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=128)
+def _policy_resource(bucket_name: str, prefix: str) -> str:
+    return f"acs:oss:*:*:{bucket_name}/{prefix.lstrip('/')}"
+
+
+@lru_cache(maxsize=128)
+def _build_policy(bucket_name: str, prefixes: tuple[str, ...]) -> str:
+    """Serialized read-only STS policy scoped to the given bucket prefixes."""
+    return json.dumps(
+        {
+            "Version": "1",
+            "Statement": [
+                {
+                    "Effect": "Allow",
+                    "Action": ["oss:GetObject", "oss:ListObjects", "oss:HeadObject"],
+                    "Resource": [_policy_resource(bucket_name, prefix) for prefix in prefixes],
+                }
+            ],
+        }
+    )
+
 
 class OSSService:
     """OSS service for URL resolving and temporary credential issuance."""
 
     def __init__(self) -> None:
         self._sts_client = None
+        self._bucket_cache: dict[tuple[str, str], Any] = {}
         self._settings = get_settings()
+        self._bundle_prefix_clean = self._settings.oss_bundle_prefix.strip("/")
+        s = self._settings
+        self._origin_prefix = f"https://{s.oss_bucket_name}.{self._normalized_endpoint_host()}/"
+        self._cdn_prefix = f"https://{s.oss_cdn_domain}/" if s.oss_cdn_domain else self._origin_prefix
+        # (object key, expires_seconds) -> (signed url, monotonic deadline)
+        self._signed_url_cache: OrderedDict[tuple[str, int], tuple[str, float]] = OrderedDict()
+        self._signed_url_lock = threading.Lock()
+        # (allowed prefixes, duration) -> (credentials, expiration)
+        self._sts_cache: dict[tuple[tuple[str, ...], int], tuple[dict[str, Any], datetime]] = {}
+        self._sts_lock = asyncio.Lock()
 
     def is_enabled(self) -> bool:
         s = self._settings
@@ -44,8 +90,7 @@ class OSSService:
         return value.lstrip("/")
 
     def _oss_origin_url(self, key: str) -> str:
-        s = self._settings
-        return f"https://{s.oss_bucket_name}.{self._normalized_endpoint_host()}/{key}"
+        return self._origin_prefix + key
 
     def _normalized_endpoint_host(self) -> str:
         """
@@ -74,31 +119,50 @@ class OSSService:
         host = self._normalized_endpoint_host()
         return f"https://{host}" if host else ""
 
-    def _cdn_url(self, key: str) -> str:
+    def _get_bucket(self):
+        """
+        Return a memoised oss2.Bucket for the configured endpoint/bucket.
+
+        Reusing the bucket keeps its requests session (and pooled keep-alive
+        connections) across calls instead of paying DNS + TLS setup each time.
+        """
         s = self._settings
-        if s.oss_cdn_domain:
-            return f"https://{s.oss_cdn_domain}/{key}"
-        return self._oss_origin_url(key)
+        cache_key = (self._bucket_endpoint_url(), s.oss_bucket_name)
+        bucket = self._bucket_cache.get(cache_key)
+        if bucket is not None:
+            return bucket
+
+        import oss2
+
+        auth = oss2.Auth(s.oss_access_key_id, s.oss_access_key_secret)
+        bucket = oss2.Bucket(
+            auth,
+            cache_key[0],
+            s.oss_bucket_name,
+            session=oss2.Session(pool_size=_OSS_CONNECTION_POOL_SIZE),
+        )
+        self._bucket_cache[cache_key] = bucket
+        return bucket
+
+    def _cdn_url(self, key: str) -> str:
+        return self._cdn_prefix + key
 
     def _build_bundle_object_key(self, bundle_type: str, scope_id: str, version: str) -> str:
-        prefix = self._settings.oss_bundle_prefix.strip("/")
-        scope_path = PurePosixPath(scope_id.lstrip("/"))
-        if not scope_path.parts:
-            raise ValueError("Invalid scope_id")
-        if ".." in scope_path.parts:
+        # Drop empty and "." segments, matching the previous PurePosixPath normalisation.
+        scope_parts = [part for part in scope_id.split("/") if part and part != "."]
+        if not scope_parts or ".." in scope_parts:
             raise ValueError("Invalid scope_id")
         if "/" in bundle_type or "/" in version:
             raise ValueError("Invalid bundle path")
 
-        if prefix:
-            path = PurePosixPath(prefix) / bundle_type / scope_path / version / "bundle.tar.gz"
-        else:
-            path = PurePosixPath(bundle_type) / scope_path / version / "bundle.tar.gz"
-        return str(path)
+        return "/".join(
+            filter(None, (self._bundle_prefix_clean, bundle_type, *scope_parts, version, "bundle.tar.gz"))
+        )
 
     async def upload_bundle(
         self,
-        file_content: bytes,
+        fileobj: BinaryIO,
+        size: int,
         bundle_type: str,
         scope_id: str,
         version: str,
@@ -106,6 +170,9 @@ class OSSService:
         """
         Upload bundle tar.gz to OSS and return object key.
         If OSS is disabled, store it under ./uploads and return a local static path.
+
+        The bundle is streamed from `fileobj` (read from its current position), so
+        memory use stays bounded by the copy/part size rather than the bundle size.
         """
         key = self._build_bundle_object_key(bundle_type=bundle_type, scope_id=scope_id, version=version)
 
@@ -115,68 +182,107 @@ class OSSService:
                 raise RuntimeError("OSS credentials are not configured")
 
             try:
-                import oss2
+                import oss2  # noqa: F401
             except Exception as exc:  # pragma: no cover - depends on optional package
                 raise RuntimeError("oss2 is required for OSS upload") from exc
 
-            auth = oss2.Auth(s.oss_access_key_id, s.oss_access_key_secret)
-            bucket = oss2.Bucket(auth, self._bucket_endpoint_url(), s.oss_bucket_name)
-            result = bucket.put_object(key, file_content)
-            if not (200 <= int(getattr(result, "status", 500)) < 300):
-                raise RuntimeError("Failed to upload bundle to OSS")
+            bucket = self._get_bucket()
+            await asyncio.to_thread(self._put_bundle_object, bucket, key, fileobj, size)
             return key
 
         local_path = Path("uploads") / key
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-        local_path.write_bytes(file_content)
+        await asyncio.to_thread(self._write_local_bundle, local_path, fileobj)
         return f"/uploads/{key}"
 
+    @classmethod
+    def _put_bundle_object(cls, bucket, key: str, fileobj: BinaryIO, size: int) -> None:
+        if size >= _MULTIPART_THRESHOLD:
+            cls._multipart_upload(bucket, key, fileobj)
+            return
+
+        result = bucket.put_object(key, fileobj)
+        if not (200 <= int(getattr(result, "status", 500)) < 300):
+            raise RuntimeError("Failed to upload bundle to OSS")
+
+    @staticmethod
+    def _write_local_bundle(local_path: Path, fileobj: BinaryIO) -> None:
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        with local_path.open("wb") as fh:
+            shutil.copyfileobj(fileobj, fh, length=_COPY_BUFFER_SIZE)
+
+    @staticmethod
+    def _remove_local_artifact(local_path: Path) -> None:
+        """Unlink a local upload and prune the folders it leaves empty under uploads/."""
+        if local_path.exists():
+            local_path.unlink()
+        parent = local_path.resolve().parent
+        uploads_root = Path("uploads").resolve()
+        while parent.exists() and parent != uploads_root and uploads_root in parent.parents:
+            if any(parent.iterdir()):
+                break
+            parent.rmdir()
+            parent = parent.parent
+
+    @staticmethod
+    def _multipart_upload(bucket, key: str, fileobj: BinaryIO) -> None:
+        """Upload a large stream part by part; aborts the upload on any failure."""
+        import oss2
+
+        upload_id = bucket.init_multipart_upload(key).upload_id
+        try:
+            parts = []
+            part_number = 1
+            while chunk := fileobj.read(_MULTIPART_PART_SIZE):
+                result = bucket.upload_part(key, upload_id, part_number, chunk)
+                parts.append(oss2.models.PartInfo(part_number, result.etag))
+                part_number += 1
+            bucket.complete_multipart_upload(key, upload_id, parts)
+        except Exception as exc:
+            try:
+                bucket.abort_multipart_upload(key, upload_id)
+            except Exception:
+                pass
+            raise RuntimeError("Failed to upload bundle to OSS") from exc
+
     async def delete_bundle_artifact(self, artifact: str) -> None:
         """
         Best-effort deletion for cleanup paths.
         Accepts object key or local /uploads path.
         """
-        value = str(artifact or "").strip()
-        if not value:
+        key = self._artifact_key(artifact)
+        if not key:
             return
 
-        key = value
-        if value.startswith("/uploads/"):
-            key = value[len("/uploads/") :]
-        elif value.startswith("uploads/"):
-            key = value[len("uploads/") :]
-
         if self.is_enabled():
+            self._invalidate_signed_urls(key)
             s = self._settings
             if not (s.oss_access_key_id and s.oss_access_key_secret):
                 return
             try:
-                import oss2
+                import oss2  # noqa: F401
             except Exception:
                 return
             try:
-                auth = oss2.Auth(s.oss_access_key_id, s.oss_access_key_secret)
-                bucket = oss2.Bucket(auth, self._bucket_endpoint_url(), s.oss_bucket_name)
-                bucket.delete_object(key)
+                bucket = self._get_bucket()
+                await asyncio.to_thread(bucket.delete_object, key)
             except Exception:
                 return
             return
 
-        local_path = Path("uploads") / key
         try:
-            if local_path.exists():
-                local_path.unlink()
-            # Best-effort prune empty folders under uploads/.
-            parent = local_path.parent
-            uploads_root = Path("uploads").resolve()
-            while parent.exists() and parent != uploads_root:
-                if any(parent.iterdir()):
-                    break
-                parent.rmdir()
-                parent = parent.parent
+            await asyncio.to_thread(self._remove_local_artifact, Path("uploads") / key)
         except Exception:
             return
 
+    @staticmethod
+    def _artifact_key(artifact: str) -> str:
+        value = str(artifact or "").strip()
+        if value.startswith("/uploads/"):
+            return value[len("/uploads/") :]
+        if value.startswith("uploads/"):
+            return value[len("uploads/") :]
+        return value
+
     def resolve_download_url(self, artifact: str, expires_seconds: int | None = None) -> str:
         """
         Resolve an artifact reference to a downloadable URL.
@@ -212,26 +318,79 @@ class OSSService:
             return raw
 
         s = self._settings
-        if s.oss_download_signed_url_enabled:
-            signed = self._try_sign_download_url(key, expires_seconds or s.oss_download_url_expire_seconds)
+        if s.oss_download_signed_url_enabled or self._cdn_auth_enabled():
+            signed = self._cached_sign_download_url(key, expires_seconds or s.oss_download_url_expire_seconds)
             if signed:
                 return signed
 
         return self._cdn_url(key)
 
+    def _cached_sign_download_url(self, key: str, expires_seconds: int) -> str | None:
+        """
+        Return a signed GET url, reusing one signed earlier for the same key/expiry.
+
+        A cached url is served for at most half of its validity window, so callers
+        always receive a url that stays valid for >= expires_seconds / 2.
+        """
+        cache_key = (key, int(expires_seconds))
+        now = time.monotonic()
+        with self._signed_url_lock:
+            entry = self._signed_url_cache.get(cache_key)
+            if entry and entry[1] > now:
+                self._signed_url_cache.move_to_end(cache_key)
+                return entry[0]
+
+        signed = self._try_sign_download_url(key, expires_seconds)
+        if not signed:
+            return None
+
+        deadline = now + max(1, int(expires_seconds) // 2)
+        with self._signed_url_lock:
+            self._signed_url_cache[cache_key] = (signed, deadline)
+            self._signed_url_cache.move_to_end(cache_key)
+            while len(self._signed_url_cache) > _SIGNED_URL_CACHE_MAXSIZE:
+                self._signed_url_cache.popitem(last=False)
+        return signed
+
+    def _invalidate_signed_urls(self, key: str) -> None:
+        with self._signed_url_lock:
+            for cache_key in [k for k in self._signed_url_cache if k[0] == key]:
+                self._signed_url_cache.pop(cache_key, None)
+
+    def _cdn_auth_enabled(self) -> bool:
+        s = self._settings
+        return bool(s.oss_cdn_domain and s.oss_cdn_auth_key)
+
+    def _sign_cdn_url(self, key: str, expires_seconds: int) -> str:
+        """
+        Sign a CDN url with Alibaba Cloud CDN URL authentication type A.
+
+        The CDN treats the url as valid until timestamp + the domain's configured
+        TTL, so the timestamp is back-dated to make it expire after expires_seconds.
+        """
+        s = self._settings
+        path = "/" + quote(key, safe="/")
+        timestamp = int(time.time()) + int(expires_seconds) - s.oss_cdn_auth_ttl_seconds
+        rand = uuid.uuid4().hex
+        uid = "0"
+        digest = hashlib.md5(f"{path}-{timestamp}-{rand}-{uid}-{s.oss_cdn_auth_key}".encode()).hexdigest()
+        return f"{self._cdn_prefix}{path.lstrip('/')}?auth_key={timestamp}-{rand}-{uid}-{digest}"
+
     def _try_sign_download_url(self, key: str, expires_seconds: int) -> str | None:
+        if self._cdn_auth_enabled():
+            return self._sign_cdn_url(key, expires_seconds)
+
         s = self._settings
         if not (s.oss_access_key_id and s.oss_access_key_secret and s.oss_bucket_name and s.oss_endpoint):
             return None
 
         try:
-            import oss2
+            import oss2  # noqa: F401
         except Exception:
             return None
 
         try:
-            auth = oss2.Auth(s.oss_access_key_id, s.oss_access_key_secret)
-            bucket = oss2.Bucket(auth, self._bucket_endpoint_url(), s.oss_bucket_name)
+            bucket = self._get_bucket()
             return bucket.sign_url("GET", key, expires_seconds)
         except Exception:
             return None
@@ -248,9 +407,7 @@ class OSSService:
         if not (s.oss_access_key_id and s.oss_access_key_secret and s.oss_bucket_name and s.oss_endpoint):
             raise RuntimeError("OSS credentials not configured")
         try:
-            import oss2
-            auth = oss2.Auth(s.oss_access_key_id, s.oss_access_key_secret)
-            bucket = oss2.Bucket(auth, self._bucket_endpoint_url(), s.oss_bucket_name)
+            bucket = self._get_bucket()
             try:
                 return bucket.sign_url(
                     "PUT",
@@ -312,41 +469,61 @@ class OSSService:
         duration = duration_seconds or s.oss_sts_duration_seconds
         duration = max(900, min(3600, int(duration)))
 
-        policy = None
-        if allowed_prefixes:
-            resources = [f"acs:oss:*:*:{s.oss_bucket_name}/{prefix.lstrip('/')}" for prefix in allowed_prefixes]
-            policy = json.dumps(
-                {
-                    "Version": "1",
-                    "Statement": [
-                        {
-                            "Effect": "Allow",
-                            "Action": ["oss:GetObject", "oss:ListObjects", "oss:HeadObject"],
-                            "Resource": resources,
-                        }
-                    ],
-                }
-            )
+        cache_key = (tuple(allowed_prefixes or ()), duration)
+        async with self._sts_lock:
+            cached = self._sts_cache.get(cache_key)
+            if cached and self._sts_still_fresh(cached[1], duration):
+                return dict(cached[0])
 
-        try:
-            from alibabacloud_sts20150401 import models as sts_models
+            policy = None
+            if allowed_prefixes:
+                policy = _build_policy(s.oss_bucket_name, cache_key[0])
 
-            request = sts_models.AssumeRoleRequest(
-                role_arn=s.oss_role_arn,
-                role_session_name=f"bundle_download_{uuid.uuid4().hex[:8]}",
-                duration_seconds=duration,
-                policy=policy,
-            )
-            response = sts_client.assume_role(request)
-            credentials = response.body.credentials
-            return {
-                "access_key_id": credentials.access_key_id,
-                "access_key_secret": credentials.access_key_secret,
-                "security_token": credentials.security_token,
-                "expiration": credentials.expiration,
-            }
-        except Exception:
+            try:
+                credentials = await asyncio.to_thread(self._assume_role, sts_client, duration, policy)
+            except Exception:
+                return None
+
+            expires_at = self._parse_sts_expiration(credentials["expiration"])
+            if expires_at is not None:
+                self._sts_cache[cache_key] = (credentials, expires_at)
+            return dict(credentials)
+
+    def _assume_role(self, sts_client, duration: int, policy: str | None) -> dict[str, Any]:
+        from alibabacloud_sts20150401 import models as sts_models
+
+        request = sts_models.AssumeRoleRequest(
+            role_arn=self._settings.oss_role_arn,
+            role_session_name=f"bundle_download_{uuid.uuid4().hex[:8]}",
+            duration_seconds=duration,
+            policy=policy,
+        )
+        response = sts_client.assume_role(request)
+        credentials = response.body.credentials
+        return {
+            "access_key_id": credentials.access_key_id,
+            "access_key_secret": credentials.access_key_secret,
+            "security_token": credentials.security_token,
+            "expiration": credentials.expiration,
+        }
+
+    @staticmethod
+    def _parse_sts_expiration(value: Any) -> datetime | None:
+        if not isinstance(value, str):
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
             return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+
+    @staticmethod
+    def _sts_still_fresh(expires_at: datetime, duration: int) -> bool:
+        # Refresh once 80% of the credential lifetime has elapsed.
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        return remaining > 0.2 * duration
 
     async def get_download_credentials(
         self,
@@ -1,6 +1,7 @@
-from datetime import timedelta
+import uuid
+from datetime import datetime, timedelta
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
@@ -21,14 +22,23 @@ def _count_events(db: Session, action: str, identifier: str, since):
     return int(db.execute(stmt).scalar_one())
 
 
-def _latest_event(db: Session, action: str, identifier: str):
-    stmt = (
-        select(AuthRateLimitEvent)
-        .where(AuthRateLimitEvent.action == action, AuthRateLimitEvent.identifier == identifier)
-        .order_by(AuthRateLimitEvent.created_at.desc())
-        .limit(1)
+def _latest_event_ts(db: Session, action: str, identifier: str) -> datetime | None:
+    stmt = select(func.max(AuthRateLimitEvent.created_at)).where(
+        AuthRateLimitEvent.action == action,
+        AuthRateLimitEvent.identifier == identifier,
+    )
+    return db.execute(stmt).scalar_one()
+
+
+def _record_events(db: Session, events: list[tuple[str, str]], now: datetime) -> None:
+    """Insert all rate-limit events in a single multi-row INSERT."""
+    stmt = insert(AuthRateLimitEvent).values(
+        [
+            {"id": uuid.uuid4(), "action": action, "identifier": identifier, "created_at": now}
+            for action, identifier in events
+        ]
     )
-    return db.execute(stmt).scalars().first()
+    db.execute(stmt)
 
 
 def check_and_record_waitlist_request(db: Session, email: str, client_ip: str) -> None:
@@ -47,14 +57,13 @@ def check_and_record_waitlist_request(db: Session, email: str, client_ip: str) -
     if email_count >= settings.waitlist_max_per_email_window:
         raise ApiError(status_code=429, code=ErrorCode.TOO_MANY_REQUESTS, message="该邮箱请求过于频繁，请稍后再试")
 
-    latest = _latest_event(db, email_action, email)
-    if latest:
-        cooldown = (now - latest.created_at).total_seconds()
+    latest_at = _latest_event_ts(db, email_action, email)
+    if latest_at:
+        cooldown = (now - latest_at).total_seconds()
         if cooldown < settings.waitlist_cooldown_seconds:
             raise ApiError(status_code=429, code=ErrorCode.TOO_MANY_REQUESTS, message="请稍等片刻后再试")
 
-    db.add(AuthRateLimitEvent(action=ip_action, identifier=client_ip, created_at=now))
-    db.add(AuthRateLimitEvent(action=email_action, identifier=email, created_at=now))
+    _record_events(db, [(ip_action, client_ip), (email_action, email)], now)
 
 
 def check_and_record_email_code_request(db: Session, email: str, client_ip: str) -> None:
@@ -72,11 +81,23 @@ def check_and_record_email_code_request(db: Session, email: str, client_ip: str)
     if ip_count >= settings.auth_code_max_per_ip_window:
         raise ApiError(status_code=429, code=ErrorCode.TOO_MANY_REQUESTS, message="Too many requests from this IP")
 
-    latest = _latest_event(db, email_action, email)
-    if latest:
-        cooldown = (now - latest.created_at).total_seconds()
+    latest_at = _latest_event_ts(db, email_action, email)
+    if latest_at:
+        cooldown = (now - latest_at).total_seconds()
         if cooldown < settings.auth_code_cooldown_seconds:
             raise ApiError(status_code=429, code=ErrorCode.TOO_MANY_REQUESTS, message="Please wait before requesting another code")
 
-    db.add(AuthRateLimitEvent(action=email_action, identifier=email, created_at=now))
-    db.add(AuthRateLimitEvent(action=ip_action, identifier=client_ip, created_at=now))
+    _record_events(db, [(email_action, email), (ip_action, client_ip)], now)
+
+
+def purge_expired_events(db: Session) -> int:
+    """Delete rate-limit events older than every window that still reads them."""
+    retention = max(
+        settings.auth_rate_limit_retention_seconds,
+        settings.auth_code_window_seconds,
+        settings.waitlist_window_seconds,
+    )
+    cutoff = now_utc() - timedelta(seconds=retention)
+    result = db.execute(delete(AuthRateLimitEvent).where(AuthRateLimitEvent.created_at < cutoff))
+    db.commit()
+    return int(result.rowcount or 0)
@@ -0,0 +1,15 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Monthly session_turn_history partitions kept ready past the current month.
+TURN_HISTORY_PARTITIONS_AHEAD = 3
+
+
+def ensure_turn_history_partitions(db: Session) -> int:
+    """Create any missing upcoming session_turn_history partitions; returns how many were created."""
+    created = db.execute(
+        text("SELECT session_turn_history_ensure_partitions(now(), :months_ahead)"),
+        {"months_ahead": TURN_HISTORY_PARTITIONS_AHEAD},
+    ).scalar_one()
+    db.commit()
+    return int(created)
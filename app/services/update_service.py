@@ -1,13 +1,25 @@
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 from app.core.config import get_settings
-from app.models import BundleRelease
+from app.models import BundleRelease, BundleReleaseLatest
 from app.schemas.updates import BundleDescriptor
 from app.services.oss import oss_service
 
 settings = get_settings()
 
+# Columns read by to_bundle_descriptor; manifest_json (JSONB) is loaded only on request.
+_DESCRIPTOR_COLUMNS = (
+    BundleRelease.bundle_type,
+    BundleRelease.scope_id,
+    BundleRelease.version,
+    BundleRelease.artifact_url,
+    BundleRelease.sha256,
+    BundleRelease.size_bytes,
+    BundleRelease.is_mandatory,
+    BundleRelease.created_at,
+)
+
 
 def to_bundle_descriptor(release: BundleRelease) -> BundleDescriptor:
     artifact_url = oss_service.resolve_download_url(
@@ -25,12 +37,23 @@ def to_bundle_descriptor(release: BundleRelease) -> BundleDescriptor:
     )
 
 
-def latest_bundle_release(db: Session, bundle_type: str, scope_id: str | None = None) -> BundleRelease | None:
-    stmt = select(BundleRelease).where(BundleRelease.bundle_type == bundle_type)
+def latest_bundle_release(
+    db: Session,
+    bundle_type: str,
+    scope_id: str | None = None,
+    *,
+    with_manifest: bool = False,
+) -> BundleRelease | None:
+    columns = (*_DESCRIPTOR_COLUMNS, BundleRelease.manifest_json) if with_manifest else _DESCRIPTOR_COLUMNS
+    stmt = select(BundleRelease).options(load_only(*columns))
     if scope_id is not None:
-        stmt = stmt.where(BundleRelease.scope_id == scope_id)
-    stmt = stmt.order_by(BundleRelease.created_at.desc())
-    return db.execute(stmt).scalars().first()
+        stmt = stmt.join(BundleReleaseLatest, BundleReleaseLatest.release_id == BundleRelease.id).where(
+            BundleReleaseLatest.bundle_type == bundle_type,
+            BundleReleaseLatest.scope_id == scope_id,
+        )
+    else:
+        stmt = stmt.where(BundleRelease.bundle_type == bundle_type).order_by(BundleRelease.created_at.desc())
+    return db.execute(stmt.limit(1)).scalars().first()
 
 
 def check_bundle_required(installed_version: str | None, release: BundleRelease | None) -> BundleDescriptor | None:
@@ -1,7 +1,10 @@
+import hashlib
 from logging.config import fileConfig
+import time
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, pool, text
+from sqlalchemy.engine import Connection
 
 from app.core.config import get_settings
 from app.db.base import Base
@@ -17,6 +20,35 @@ config.set_main_option("sqlalchemy.url", settings.database_url)
 
 target_metadata = Base.metadata
 
+MIGRATION_LOCK_POLL_SECONDS = 0.5
+
+
+def _migration_lock_key(connection: Connection) -> int:
+    schema = connection.execute(text("SELECT current_schema()")).scalar_one()
+    digest = hashlib.sha256(f"alembic:{schema}".encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def _acquire_migration_lock(connection: Connection, key: int) -> None:
+    """
+    Take the session-level migration lock by polling pg_try_advisory_lock.
+
+    Each attempt commits immediately, so a waiting replica never holds an open
+    transaction that a CREATE INDEX CONCURRENTLY in the lock holder would wait on.
+    """
+    while True:
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar_one()
+        connection.commit()
+        if acquired:
+            return
+        time.sleep(MIGRATION_LOCK_POLL_SECONDS)
+
+
+def _release_migration_lock(connection: Connection, key: int) -> None:
+    connection.rollback()
+    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+    connection.commit()
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -40,10 +72,19 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+        lock_key = None
+        if connection.dialect.name == "postgresql":
+            lock_key = _migration_lock_key(connection)
+            _acquire_migration_lock(connection, lock_key)
+
+        try:
+            context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
 
-        with context.begin_transaction():
-            context.run_migrations()
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if lock_key is not None:
+                _release_migration_lock(connection, lock_key)
 
 
 if context.is_offline_mode():
@@ -1,5 +1,8 @@
 """add intro_text to course_chapters
 
+Requires PostgreSQL 11+, where the constant '' default is catalog metadata,
+so the column is added without a table rewrite and the default is kept.
+
 Revision ID: 20260215_0003
 Revises: 20260210_0002
 Create Date: 2026-02-15 15:30:00.000000
@@ -18,7 +21,6 @@ depends_on = None
 
 def upgrade() -> None:
     op.add_column("course_chapters", sa.Column("intro_text", sa.Text(), nullable=False, server_default=""))
-    op.alter_column("course_chapters", "intro_text", server_default=None)
 
 
 def downgrade() -> None:
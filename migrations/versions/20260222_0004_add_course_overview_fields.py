@@ -1,12 +1,15 @@
 """add overview fields to courses
 
+All four columns are added in one ALTER TABLE so the ACCESS EXCLUSIVE lock on
+courses is taken once. Requires PostgreSQL 11+, where the constant '' default
+is catalog metadata, so the table is not rewritten and the default is kept.
+
 Revision ID: 20260222_0004
 Revises: 20260215_0003
 Create Date: 2026-02-22 00:00:00.000000
 """
 
 from alembic import op
-import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
@@ -16,12 +19,16 @@ branch_labels = None
 depends_on = None
 
 
+OVERVIEW_COLUMNS = ("overview_experience", "overview_gains", "overview_necessity", "overview_journey")
+
+
 def upgrade() -> None:
-    for col in ("overview_experience", "overview_gains", "overview_necessity", "overview_journey"):
-        op.add_column("courses", sa.Column(col, sa.Text(), nullable=False, server_default=""))
-        op.alter_column("courses", col, server_default=None)
+    op.execute(
+        "ALTER TABLE courses "
+        + ", ".join(f"ADD COLUMN {col} TEXT NOT NULL DEFAULT ''" for col in OVERVIEW_COLUMNS)
+    )
 
 
 def downgrade() -> None:
-    for col in ("overview_experience", "overview_gains", "overview_necessity", "overview_journey"):
+    for col in OVERVIEW_COLUMNS:
         op.drop_column("courses", col)
@@ -15,6 +15,17 @@ down_revision = "20260222_0004"
 branch_labels = None
 depends_on = None
 
+# (index name, table, column) — built CONCURRENTLY so they never block writes.
+_INDEXES = (
+    ("ix_learning_sessions_user_id", "learning_sessions", "user_id"),
+    ("ix_learning_sessions_chapter_id", "learning_sessions", "chapter_id"),
+    ("ix_session_turn_history_user_id", "session_turn_history", "user_id"),
+    ("ix_session_turn_history_session_id", "session_turn_history", "session_id"),
+    ("ix_session_memory_state_user_id", "session_memory_state", "user_id"),
+    ("ix_session_dynamic_report_user_id", "session_dynamic_report", "user_id"),
+    ("ix_user_submitted_files_user_id", "user_submitted_files", "user_id"),
+)
+
 
 def upgrade() -> None:
     op.create_table(
@@ -26,8 +37,6 @@ def upgrade() -> None:
         sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.Column("last_active_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
     )
-    op.create_index("ix_learning_sessions_user_id", "learning_sessions", ["user_id"])
-    op.create_index("ix_learning_sessions_chapter_id", "learning_sessions", ["chapter_id"])
 
     op.create_table(
         "session_turn_history",
@@ -42,8 +51,6 @@ def upgrade() -> None:
         sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.UniqueConstraint("session_id", "turn_index", name="uq_turn_session_index"),
     )
-    op.create_index("ix_session_turn_history_user_id", "session_turn_history", ["user_id"])
-    op.create_index("ix_session_turn_history_session_id", "session_turn_history", ["session_id"])
 
     op.create_table(
         "session_memory_state",
@@ -54,7 +61,6 @@ def upgrade() -> None:
         sa.Column("memory_json", JSONB(), nullable=False, server_default="{}"),
         sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
     )
-    op.create_index("ix_session_memory_state_user_id", "session_memory_state", ["user_id"])
 
     op.create_table(
         "session_dynamic_report",
@@ -65,7 +71,6 @@ def upgrade() -> None:
         sa.Column("report_md", sa.Text(), nullable=False),
         sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
     )
-    op.create_index("ix_session_dynamic_report_user_id", "session_dynamic_report", ["user_id"])
 
     op.create_table(
         "user_submitted_files",
@@ -78,19 +83,20 @@ def upgrade() -> None:
         sa.Column("file_size_bytes", sa.Integer(), nullable=False),
         sa.Column("submitted_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
     )
-    op.create_index("ix_user_submitted_files_user_id", "user_submitted_files", ["user_id"])
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, column in _INDEXES:
+            op.create_index(name, table, [column], postgresql_concurrently=True, if_not_exists=True)
 
 
 def downgrade() -> None:
-    op.drop_index("ix_user_submitted_files_user_id", table_name="user_submitted_files")
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
     op.drop_table("user_submitted_files")
-    op.drop_index("ix_session_dynamic_report_user_id", table_name="session_dynamic_report")
     op.drop_table("session_dynamic_report")
-    op.drop_index("ix_session_memory_state_user_id", table_name="session_memory_state")
     op.drop_table("session_memory_state")
-    op.drop_index("ix_session_turn_history_session_id", table_name="session_turn_history")
-    op.drop_index("ix_session_turn_history_user_id", table_name="session_turn_history")
     op.drop_table("session_turn_history")
-    op.drop_index("ix_learning_sessions_chapter_id", table_name="learning_sessions")
-    op.drop_index("ix_learning_sessions_user_id", table_name="learning_sessions")
     op.drop_table("learning_sessions")
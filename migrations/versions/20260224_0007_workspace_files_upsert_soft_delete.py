@@ -14,6 +14,22 @@ down_revision = "20260224_0006"
 branch_labels = None
 depends_on = None
 
+DEDUPE_BATCH_SIZE = 5000
+
+# Rows that have a newer sibling for the same (user_id, chapter_id, filename).
+_STALE_DUPLICATES = """
+    SELECT u.id
+    FROM user_submitted_files u
+    WHERE EXISTS (
+        SELECT 1
+        FROM user_submitted_files n
+        WHERE n.user_id = u.user_id
+          AND n.chapter_id = u.chapter_id
+          AND n.filename = u.filename
+          AND n.id > u.id
+    )
+"""
+
 
 def upgrade() -> None:
     # Add new columns
@@ -27,14 +43,10 @@ def upgrade() -> None:
     )
 
     # Deduplicate: keep only the row with the highest id for each (user_id, chapter_id, filename).
-    op.execute("""
-        DELETE FROM user_submitted_files
-        WHERE id NOT IN (
-            SELECT MAX(id)
-            FROM user_submitted_files
-            GROUP BY user_id, chapter_id, filename
-        )
-    """)
+    if op.get_context().as_sql:
+        op.execute(f"DELETE FROM user_submitted_files WHERE id IN ({_STALE_DUPLICATES})")
+    else:
+        _delete_duplicates_in_batches()
 
     # Add unique constraint so each user/chapter/filename has exactly one row.
     op.create_unique_constraint(
@@ -44,6 +56,35 @@ def upgrade() -> None:
     )
 
 
+def _delete_duplicates_in_batches() -> None:
+    """Delete stale duplicates DEDUPE_BATCH_SIZE rows per committed transaction."""
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        # Temporary index so each batch probes siblings instead of scanning the table.
+        op.create_index(
+            "ix_user_submitted_files_dedupe",
+            "user_submitted_files",
+            ["user_id", "chapter_id", "filename", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        while True:
+            result = bind.execute(
+                sa.text(
+                    f"DELETE FROM user_submitted_files WHERE id IN ({_STALE_DUPLICATES} LIMIT :batch_size)"
+                ),
+                {"batch_size": DEDUPE_BATCH_SIZE},
+            )
+            if result.rowcount == 0:
+                break
+        op.drop_index(
+            "ix_user_submitted_files_dedupe",
+            table_name="user_submitted_files",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
 def downgrade() -> None:
     op.drop_constraint("uq_user_chapter_filename", "user_submitted_files", type_="unique")
     op.drop_column("user_submitted_files", "is_deleted")
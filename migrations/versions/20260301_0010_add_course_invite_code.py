@@ -1,12 +1,15 @@
 """Add invite_code column to courses table.
 
+The column and its UNIQUE constraint are added in one ALTER TABLE, taking the
+courses lock once. The constraint's btree index serves invite-code lookups,
+so no separate index is created.
+
 Revision ID: 20260301_0010
 Revises: 20260226_0009
 Create Date: 2026-03-01 10:00:00.000000
 """
 
 from alembic import op
-import sqlalchemy as sa
 
 
 revision = "20260301_0010"
@@ -16,15 +19,14 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.add_column(
-        "courses",
-        sa.Column("invite_code", sa.String(8), nullable=True),
+    op.execute(
+        "ALTER TABLE courses "
+        "ADD COLUMN invite_code VARCHAR(8), "
+        "ADD CONSTRAINT uq_courses_invite_code UNIQUE (invite_code)"
     )
-    op.create_unique_constraint("uq_courses_invite_code", "courses", ["invite_code"])
-    op.create_index("ix_courses_invite_code", "courses", ["invite_code"])
 
 
 def downgrade() -> None:
-    op.drop_index("ix_courses_invite_code", table_name="courses")
+    op.execute("DROP INDEX IF EXISTS ix_courses_invite_code")
     op.drop_constraint("uq_courses_invite_code", "courses", type_="unique")
     op.drop_column("courses", "invite_code")
@@ -1,11 +1,18 @@
 """Backfill existing learning_sessions with bundle_version='1.0.0'.
 
+Online upgrades update BACKFILL_BATCH_SIZE rows per committed transaction so
+WAL, row locks and replica lag stay bounded; re-running resumes where a
+previous run stopped.
+
 Revision ID: 20260301_0012
 Revises: 20260301_0011
 Create Date: 2026-03-01 16:00:00.000000
 """
 
+import time
+
 from alembic import op
+import sqlalchemy as sa
 
 
 revision = "20260301_0012"
@@ -13,11 +20,37 @@ down_revision = "20260301_0011"
 branch_labels = None
 depends_on = None
 
+BACKFILL_BATCH_SIZE = 5000
+BACKFILL_PAUSE_SECONDS = 0.05
+
 
 def upgrade() -> None:
-    op.execute(
-        "UPDATE learning_sessions SET bundle_version = '1.0.0' WHERE bundle_version IS NULL"
-    )
+    if op.get_context().as_sql:
+        op.execute(
+            "UPDATE learning_sessions SET bundle_version = '1.0.0' WHERE bundle_version IS NULL"
+        )
+        return
+
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        while True:
+            updated = bind.execute(
+                sa.text(
+                    """
+                    UPDATE learning_sessions
+                    SET bundle_version = '1.0.0'
+                    WHERE session_id IN (
+                        SELECT session_id FROM learning_sessions
+                        WHERE bundle_version IS NULL
+                        LIMIT :batch_size
+                    )
+                    """
+                ),
+                {"batch_size": BACKFILL_BATCH_SIZE},
+            ).rowcount
+            if updated == 0:
+                break
+            time.sleep(BACKFILL_PAUSE_SECONDS)
 
 
 def downgrade() -> None:
@@ -0,0 +1,31 @@
+"""Add composite (bundle_type, scope_id, created_at DESC) index to bundle_releases.
+
+Serves latest_bundle_release's `WHERE bundle_type = ? AND scope_id = ?
+ORDER BY created_at DESC LIMIT 1` as a single btree descent instead of a
+bitmap-or over the single-column indexes plus a sort.
+
+Revision ID: 20261016_0014
+Revises: 20260313_0013
+Create Date: 2026-10-16 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0014"
+down_revision = "20260313_0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_bundle_releases_btype_scope_created",
+        "bundle_releases",
+        ["bundle_type", "scope_id", sa.text("created_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bundle_releases_btype_scope_created", table_name="bundle_releases")
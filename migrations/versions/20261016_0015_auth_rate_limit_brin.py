@@ -0,0 +1,33 @@
+"""Replace the auth_rate_limit_events created_at btree with a BRIN index.
+
+Rows are append-only in created_at order and are purged on a rolling
+retention window, so a BRIN index covers the range predicates used by the
+purge at a fraction of the btree's size.
+
+Revision ID: 20261016_0015
+Revises: 20261016_0014
+Create Date: 2026-10-16 11:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0015"
+down_revision = "20261016_0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_auth_rate_limit_events_created_at", table_name="auth_rate_limit_events")
+    op.create_index(
+        "ix_auth_rate_limit_events_created_at_brin",
+        "auth_rate_limit_events",
+        ["created_at"],
+        postgresql_using="brin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auth_rate_limit_events_created_at_brin", table_name="auth_rate_limit_events")
+    op.create_index("ix_auth_rate_limit_events_created_at", "auth_rate_limit_events", ["created_at"], unique=False)
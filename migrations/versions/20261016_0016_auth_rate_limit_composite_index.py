@@ -0,0 +1,30 @@
+"""Add composite (action, identifier, created_at) index to auth_rate_limit_events.
+
+Every rate-limit probe filters on action and identifier and then either
+counts a created_at range or takes max(created_at); the composite serves
+both as an index-only range scan.
+
+Revision ID: 20261016_0016
+Revises: 20261016_0015
+Create Date: 2026-10-16 12:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0016"
+down_revision = "20261016_0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_auth_rate_limit_events_action_identifier_created",
+        "auth_rate_limit_events",
+        ["action", "identifier", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auth_rate_limit_events_action_identifier_created", table_name="auth_rate_limit_events")
@@ -0,0 +1,80 @@
+"""Add trigger-maintained bundle_releases_latest pointer table.
+
+One row per (bundle_type, scope_id) pointing at the newest release, kept in
+sync by a row trigger on bundle_releases so update polls resolve the latest
+release with two primary-key lookups instead of an ordered index probe.
+
+Revision ID: 20261016_0017
+Revises: 20261016_0016
+Create Date: 2026-10-16 13:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261016_0017"
+down_revision = "20261016_0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bundle_releases_latest",
+        sa.Column("bundle_type", sa.String(length=64), nullable=False),
+        sa.Column("scope_id", sa.String(length=255), nullable=False),
+        sa.Column("release_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("bundle_type", "scope_id"),
+    )
+    op.create_index("ix_bundle_releases_latest_release_id", "bundle_releases_latest", ["release_id"], unique=False)
+
+    # Inserts advance the pointer (ties go to the later insert); deleting the
+    # current latest falls back to the newest remaining release for that scope.
+    op.execute("""
+        CREATE FUNCTION bundle_releases_latest_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO bundle_releases_latest (bundle_type, scope_id, release_id, created_at)
+                VALUES (NEW.bundle_type, NEW.scope_id, NEW.id, NEW.created_at)
+                ON CONFLICT (bundle_type, scope_id) DO UPDATE
+                    SET release_id = EXCLUDED.release_id, created_at = EXCLUDED.created_at
+                    WHERE bundle_releases_latest.created_at <= EXCLUDED.created_at;
+                RETURN NEW;
+            END IF;
+
+            DELETE FROM bundle_releases_latest WHERE release_id = OLD.id;
+            IF FOUND THEN
+                INSERT INTO bundle_releases_latest (bundle_type, scope_id, release_id, created_at)
+                SELECT bundle_type, scope_id, id, created_at
+                FROM bundle_releases
+                WHERE bundle_type = OLD.bundle_type AND scope_id = OLD.scope_id
+                ORDER BY created_at DESC
+                LIMIT 1
+                ON CONFLICT (bundle_type, scope_id) DO NOTHING;
+            END IF;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_bundle_releases_latest
+        AFTER INSERT OR DELETE ON bundle_releases
+        FOR EACH ROW EXECUTE FUNCTION bundle_releases_latest_sync()
+    """)
+
+    op.execute("""
+        INSERT INTO bundle_releases_latest (bundle_type, scope_id, release_id, created_at)
+        SELECT DISTINCT ON (bundle_type, scope_id) bundle_type, scope_id, id, created_at
+        FROM bundle_releases
+        ORDER BY bundle_type, scope_id, created_at DESC
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_bundle_releases_latest ON bundle_releases")
+    op.execute("DROP FUNCTION IF EXISTS bundle_releases_latest_sync()")
+    op.drop_index("ix_bundle_releases_latest_release_id", table_name="bundle_releases_latest")
+    op.drop_table("bundle_releases_latest")
@@ -0,0 +1,32 @@
+"""Drop single-column indexes covered by the composite indexes.
+
+ix_bundle_releases_btype_scope_created and
+ix_auth_rate_limit_events_action_identifier_created lead with the same
+columns, so the single-column btrees only add write and cache overhead.
+
+Revision ID: 20261016_0018
+Revises: 20261016_0017
+Create Date: 2026-10-16 14:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0018"
+down_revision = "20261016_0017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_bundle_releases_bundle_type", table_name="bundle_releases")
+    op.drop_index("ix_bundle_releases_scope_id", table_name="bundle_releases")
+    op.drop_index("ix_auth_rate_limit_events_action", table_name="auth_rate_limit_events")
+    op.drop_index("ix_auth_rate_limit_events_identifier", table_name="auth_rate_limit_events")
+
+
+def downgrade() -> None:
+    op.create_index("ix_auth_rate_limit_events_identifier", "auth_rate_limit_events", ["identifier"], unique=False)
+    op.create_index("ix_auth_rate_limit_events_action", "auth_rate_limit_events", ["action"], unique=False)
+    op.create_index("ix_bundle_releases_scope_id", "bundle_releases", ["scope_id"], unique=False)
+    op.create_index("ix_bundle_releases_bundle_type", "bundle_releases", ["bundle_type"], unique=False)
@@ -0,0 +1,68 @@
+"""Replace per-user single-column indexes on session sync tables with composites.
+
+- learning_sessions: (user_id, chapter_id, last_active_at DESC) serves the
+  per-chapter session list/state queries as an ordered range scan.
+- user_submitted_files: (user_id, submitted_at DESC) serves the file list;
+  user+chapter lookups already use uq_user_chapter_filename.
+- session_turn_history, session_memory_state, session_dynamic_report are only
+  read by session_id, so their user_id indexes are dropped.
+
+Revision ID: 20261016_0019
+Revises: 20261016_0018
+Create Date: 2026-10-16 15:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0019"
+down_revision = "20261016_0018"
+branch_labels = None
+depends_on = None
+
+_DROPPED_USER_INDEXES = (
+    ("ix_learning_sessions_user_id", "learning_sessions"),
+    ("ix_session_turn_history_user_id", "session_turn_history"),
+    ("ix_session_memory_state_user_id", "session_memory_state"),
+    ("ix_session_dynamic_report_user_id", "session_dynamic_report"),
+    ("ix_user_submitted_files_user_id", "user_submitted_files"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_learning_sessions_user_chapter_last_active",
+            "learning_sessions",
+            ["user_id", "chapter_id", sa.text("last_active_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_user_submitted_files_user_submitted",
+            "user_submitted_files",
+            ["user_id", sa.text("submitted_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table in _DROPPED_USER_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in reversed(_DROPPED_USER_INDEXES):
+            op.create_index(name, table, ["user_id"], postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index(
+            "ix_user_submitted_files_user_submitted",
+            table_name="user_submitted_files",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_learning_sessions_user_chapter_last_active",
+            table_name="learning_sessions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,27 @@
+"""Drop ix_courses_invite_code, duplicated by uq_courses_invite_code.
+
+Databases migrated before 20260301_0010 stopped creating it still carry the
+plain index next to the UNIQUE constraint's own btree.
+
+Revision ID: 20261016_0020
+Revises: 20261016_0019
+Create Date: 2026-10-16 16:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0020"
+down_revision = "20261016_0019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_courses_invite_code", table_name="courses", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    # 20260301_0010 no longer creates this index, so downgrade leaves it absent.
+    pass
@@ -0,0 +1,38 @@
+"""Drop plain indexes that duplicate a UNIQUE constraint's index.
+
+A UNIQUE constraint already implies a btree index; a secondary index on the
+same column is redundant:
+- ix_users_email (uq_users_email)
+- ix_courses_course_code (uq_courses_code)
+- ix_analytics_events_event_id (uq_analytics_events_event_id)
+
+Revision ID: 20261016_0021
+Revises: 20261016_0020
+Create Date: 2026-10-16 17:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0021"
+down_revision = "20261016_0020"
+branch_labels = None
+depends_on = None
+
+_DUPLICATE_INDEXES = (
+    ("ix_users_email", "users", "email"),
+    ("ix_courses_course_code", "courses", "course_code"),
+    ("ix_analytics_events_event_id", "analytics_events", "event_id"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in _DUPLICATE_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in reversed(_DUPLICATE_INDEXES):
+            op.create_index(name, table, [column], postgresql_concurrently=True, if_not_exists=True)
@@ -0,0 +1,62 @@
+"""Store learning session ids as native uuid instead of String(64).
+
+Session ids have always been minted server-side as ``uuid4().hex``, so every
+existing value casts losslessly with ``::uuid``; the 16-byte key shrinks the
+primary key and the three child foreign keys/indexes that reference it.
+``user_submitted_files.session_id`` is client-supplied and not a foreign key,
+so it stays a string.
+
+Revision ID: 20261016_0022
+Revises: 20261016_0021
+Create Date: 2026-10-16 18:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0022"
+down_revision = "20261016_0021"
+branch_labels = None
+depends_on = None
+
+_CHILD_TABLES = ("session_turn_history", "session_memory_state", "session_dynamic_report")
+
+
+def _drop_session_fks() -> None:
+    for table in _CHILD_TABLES:
+        op.drop_constraint(f"{table}_session_id_fkey", table, type_="foreignkey")
+
+
+def _create_session_fks() -> None:
+    for table in _CHILD_TABLES:
+        op.create_foreign_key(
+            f"{table}_session_id_fkey", table, "learning_sessions", ["session_id"], ["session_id"]
+        )
+
+
+def upgrade() -> None:
+    _drop_session_fks()
+    op.execute(
+        "ALTER TABLE learning_sessions "
+        "ALTER COLUMN session_id TYPE uuid USING session_id::uuid, "
+        "ALTER COLUMN session_id SET DEFAULT gen_random_uuid()"
+    )
+    for table in _CHILD_TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN session_id TYPE uuid USING session_id::uuid")
+    _create_session_fks()
+
+
+def downgrade() -> None:
+    _drop_session_fks()
+    # Restore the original dashless hex form the API has always returned.
+    op.execute(
+        "ALTER TABLE learning_sessions "
+        "ALTER COLUMN session_id DROP DEFAULT, "
+        "ALTER COLUMN session_id TYPE varchar(64) USING replace(session_id::text, '-', '')"
+    )
+    for table in _CHILD_TABLES:
+        op.execute(
+            f"ALTER TABLE {table} "
+            "ALTER COLUMN session_id TYPE varchar(64) USING replace(session_id::text, '-', '')"
+        )
+    _create_session_fks()
@@ -0,0 +1,190 @@
+"""Partition session_turn_history by month on created_at.
+
+Every chat turn appends a row here, so the table and its indexes grow without
+bound. Monthly RANGE partitions keep the recent (hot) partitions' indexes
+small and let old months be detached instead of mass-deleted.
+
+Partitioning constraints: the primary key and the (session_id, turn_index)
+unique constraint must include the partition key, so both gain created_at.
+That no longer stops a second row for the same turn, so a BEFORE INSERT
+trigger enforces (session_id, turn_index) uniqueness instead.
+
+Future partitions are created by session_turn_history_ensure_partitions(),
+which the API's periodic maintenance loop calls. Rows outside every monthly
+range land in session_turn_history_default rather than failing, and are moved
+into their month's partition when it is created.
+
+Revision ID: 20261016_0023
+Revises: 20261016_0022
+Create Date: 2026-10-16 19:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0023"
+down_revision = "20261016_0022"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = "id, user_id, session_id, chapter_id, turn_index, user_message, companion_response, turn_outcome, created_at"
+
+# Creates one partition per UTC month from the month of ``start_at`` through
+# ``months_ahead`` months past the current one; returns how many it created.
+# TimeZone is pinned to UTC because timestamptz + interval '1 month' steps in
+# the session time zone, which would misalign the bounds with UTC months.
+_ENSURE_PARTITIONS_FN = """
+CREATE OR REPLACE FUNCTION session_turn_history_ensure_partitions(start_at timestamptz, months_ahead integer)
+RETURNS integer LANGUAGE plpgsql SET TimeZone = 'UTC' AS $$
+DECLARE
+    month_start timestamptz := date_trunc('month', start_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    last_start timestamptz := (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => months_ahead)) AT TIME ZONE 'UTC';
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= last_start LOOP
+        partition_name := 'session_turn_history_' || to_char(month_start AT TIME ZONE 'UTC', 'YYYYMM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I (LIKE session_turn_history INCLUDING DEFAULTS INCLUDING STORAGE)', partition_name);
+            -- Column storage (e.g. EXTERNAL from 20261016_0024) is not inherited
+            -- on ATTACH; refuse a partition that would silently drop it.
+            IF EXISTS (
+                SELECT 1
+                FROM pg_attribute child
+                JOIN pg_attribute parent
+                  ON parent.attrelid = 'session_turn_history'::regclass AND parent.attname = child.attname
+                WHERE child.attrelid = partition_name::regclass
+                  AND child.attnum > 0 AND NOT child.attisdropped
+                  AND child.attstorage <> parent.attstorage
+            ) THEN
+                RAISE EXCEPTION 'partition % column storage differs from session_turn_history', partition_name;
+            END IF;
+            -- The default partition may already hold rows for this month; they
+            -- must move out before a partition covering them can be attached.
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM session_turn_history_default '
+                'WHERE created_at >= %L AND created_at < %L RETURNING *) INSERT INTO %I SELECT * FROM moved',
+                month_start, month_start + interval '1 month', partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE session_turn_history ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_start + interval '1 month'
+            );
+            created := created + 1;
+        END IF;
+        month_start := month_start + interval '1 month';
+    END LOOP;
+    RETURN created;
+END
+$$
+"""
+
+
+# Stands in for the (session_id, turn_index) unique constraint, which a table
+# partitioned on created_at cannot declare. The advisory lock serializes
+# inserts of the same turn so the existence check sees a concurrent commit.
+_UNIQUE_TURN_FN = """
+CREATE OR REPLACE FUNCTION session_turn_history_unique_turn()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtextextended(NEW.session_id::text || ':' || NEW.turn_index, 0));
+    IF EXISTS (
+        SELECT 1 FROM session_turn_history WHERE session_id = NEW.session_id AND turn_index = NEW.turn_index
+    ) THEN
+        RAISE unique_violation USING
+            MESSAGE = format('duplicate turn %s for session %s', NEW.turn_index, NEW.session_id),
+            CONSTRAINT = 'uq_turn_session_index';
+    END IF;
+    RETURN NEW;
+END
+$$
+"""
+
+
+def _swap_in_new_table(create_sql: str) -> None:
+    """Rename the current table aside and create its replacement under the original name."""
+    op.execute("ALTER TABLE session_turn_history RENAME TO session_turn_history_old")
+    op.execute("ALTER SEQUENCE session_turn_history_id_seq RENAME TO session_turn_history_old_id_seq")
+    # Constraint-backed index names are schema-wide, so free them for the new table.
+    op.execute("ALTER TABLE session_turn_history_old RENAME CONSTRAINT session_turn_history_pkey TO session_turn_history_old_pkey")
+    op.execute("ALTER TABLE session_turn_history_old RENAME CONSTRAINT uq_turn_session_index TO uq_turn_session_index_old")
+    op.execute(create_sql)
+
+
+def _copy_and_drop_old_table() -> None:
+    op.execute(f"INSERT INTO session_turn_history ({_COLUMNS}) SELECT {_COLUMNS} FROM session_turn_history_old")
+    op.execute(
+        "SELECT setval('session_turn_history_id_seq', "
+        "coalesce((SELECT max(id) FROM session_turn_history), 0) + 1, false)"
+    )
+    op.execute("DROP TABLE session_turn_history_old")
+
+
+def _add_foreign_keys_and_indexes() -> None:
+    op.create_foreign_key("session_turn_history_user_id_fkey", "session_turn_history", "users", ["user_id"], ["id"])
+    op.create_foreign_key(
+        "session_turn_history_session_id_fkey",
+        "session_turn_history",
+        "learning_sessions",
+        ["session_id"],
+        ["session_id"],
+    )
+    op.create_index("ix_session_turn_history_session_id", "session_turn_history", ["session_id"])
+
+
+def upgrade() -> None:
+    _swap_in_new_table(
+        """
+        CREATE TABLE session_turn_history (
+            id bigserial NOT NULL,
+            user_id uuid NOT NULL,
+            session_id uuid NOT NULL,
+            chapter_id varchar(128) NOT NULL,
+            turn_index integer NOT NULL,
+            user_message text NOT NULL,
+            companion_response text NOT NULL,
+            turn_outcome jsonb NOT NULL DEFAULT '{}',
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT session_turn_history_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT uq_turn_session_index UNIQUE (session_id, turn_index, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE session_turn_history_default PARTITION OF session_turn_history DEFAULT")
+    op.execute(_ENSURE_PARTITIONS_FN)
+    op.execute(
+        "SELECT session_turn_history_ensure_partitions("
+        "coalesce((SELECT min(created_at) FROM session_turn_history_old), now()), 3)"
+    )
+    _copy_and_drop_old_table()
+    _add_foreign_keys_and_indexes()
+    # After the copy: the old rows were already unique.
+    op.execute(_UNIQUE_TURN_FN)
+    op.execute(
+        "CREATE TRIGGER session_turn_history_unique_turn BEFORE INSERT ON session_turn_history "
+        "FOR EACH ROW EXECUTE FUNCTION session_turn_history_unique_turn()"
+    )
+
+
+def downgrade() -> None:
+    _swap_in_new_table(
+        """
+        CREATE TABLE session_turn_history (
+            id bigserial NOT NULL,
+            user_id uuid NOT NULL,
+            session_id uuid NOT NULL,
+            chapter_id varchar(128) NOT NULL,
+            turn_index integer NOT NULL,
+            user_message text NOT NULL,
+            companion_response text NOT NULL,
+            turn_outcome jsonb NOT NULL DEFAULT '{}',
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT session_turn_history_pkey PRIMARY KEY (id),
+            CONSTRAINT uq_turn_session_index UNIQUE (session_id, turn_index)
+        )
+        """
+    )
+    _copy_and_drop_old_table()
+    op.execute("DROP FUNCTION session_turn_history_ensure_partitions(timestamptz, integer)")
+    op.execute("DROP FUNCTION session_turn_history_unique_turn()")
+    _add_foreign_keys_and_indexes()
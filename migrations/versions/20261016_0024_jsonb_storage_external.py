@@ -0,0 +1,41 @@
+"""Store the per-row session/bug-report JSONB blobs uncompressed.
+
+The default EXTENDED storage pglz-compresses large values, which costs CPU on
+every read and write and gains little for small, mostly-unique JSON. EXTERNAL
+still moves oversized values out of line but skips compression. The change
+only affects newly written values; existing rows are left as they are.
+On the partitioned session_turn_history the setting recurses to existing
+partitions, and session_turn_history_ensure_partitions() copies it into (and
+checks it on) every partition created afterwards.
+
+No GIN indexes are added: nothing queries these columns by containment.
+
+Revision ID: 20261016_0024
+Revises: 20261016_0023
+Create Date: 2026-10-16 20:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0024"
+down_revision = "20261016_0023"
+branch_labels = None
+depends_on = None
+
+_JSONB_COLUMNS = (
+    ("session_turn_history", "turn_outcome"),
+    ("session_memory_state", "memory_json"),
+    ("session_memory_state", "agent_state_json"),
+    ("bug_reports", "metadata_json"),
+)
+
+
+def upgrade() -> None:
+    for table, column in _JSONB_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    for table, column in _JSONB_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE EXTENDED")
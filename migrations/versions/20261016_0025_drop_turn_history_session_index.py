@@ -0,0 +1,32 @@
+"""Drop ix_session_turn_history_session_id.
+
+Turn history is read by ``session_id = ?`` ordered by turn_index, which the
+uq_turn_session_index (session_id, turn_index, created_at) index already
+serves as a prefix scan. The per-user single-column indexes on the session
+sync tables were removed in 20261016_0019.
+
+Postgres cannot drop or build an index on a partitioned table CONCURRENTLY,
+so these run as plain statements; the drop is metadata plus file unlinks.
+
+Revision ID: 20261016_0025
+Revises: 20261016_0024
+Create Date: 2026-10-16 21:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0025"
+down_revision = "20261016_0024"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_session_turn_history_session_id", table_name="session_turn_history", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_session_turn_history_session_id", "session_turn_history", ["session_id"], if_not_exists=True
+    )
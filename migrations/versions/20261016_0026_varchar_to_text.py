@@ -0,0 +1,49 @@
+"""Declare bounded varchar identifier/name columns as text.
+
+varchar(N) and text share the same on-disk format; the only difference is a
+length check on every write, and widening N later means another ALTER TYPE.
+varchar -> text is binary-coercible, so this is a catalog-only change with no
+table or index rewrite. Length limits on client-supplied values are enforced
+by the request schemas instead.
+
+Revision ID: 20261016_0026
+Revises: 20261016_0025
+Create Date: 2026-10-16 22:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261016_0026"
+down_revision = "20261016_0025"
+branch_labels = None
+depends_on = None
+
+# table -> ((column, previous varchar length), ...)
+_TEXT_COLUMNS = {
+    "users": (("email", 255),),
+    "email_verification_codes": (("email", 255),),
+    "courses": (("invite_code", 8),),
+    "chapter_progress": (("last_session_id", 255),),
+    "analytics_events": (("course_id", 128), ("chapter_id", 128), ("session_id", 255)),
+    "learning_sessions": (("chapter_id", 128), ("course_id", 128), ("bundle_version", 32)),
+    "session_turn_history": (("chapter_id", 128),),
+    "session_memory_state": (("chapter_id", 128),),
+    "session_dynamic_report": (("chapter_id", 128),),
+    "user_submitted_files": (("session_id", 64), ("chapter_id", 128), ("filename", 255), ("oss_key", 500)),
+    "bug_reports": (("bug_id", 16), ("oss_key", 500), ("app_version", 64), ("platform", 64)),
+    "invite_codes": (("code", 32),),
+    "waitlist_entries": (("email", 255),),
+}
+
+
+def upgrade() -> None:
+    for table, columns in _TEXT_COLUMNS.items():
+        clauses = ", ".join(f"ALTER COLUMN {column} TYPE text" for column, _ in columns)
+        op.execute(f"ALTER TABLE {table} {clauses}")
+
+
+def downgrade() -> None:
+    for table, columns in _TEXT_COLUMNS.items():
+        clauses = ", ".join(f"ALTER COLUMN {column} TYPE varchar({length})" for column, length in columns)
+        op.execute(f"ALTER TABLE {table} {clauses}")
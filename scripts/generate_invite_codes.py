@@ -4,6 +4,7 @@
 Usage:
     python scripts/generate_invite_codes.py --count 1000
     python scripts/generate_invite_codes.py --count 50 --output codes.txt
+    python scripts/generate_invite_codes.py --count 100000 --concurrency 16
 
 Environment variables:
     ADMIN_API_KEY   - Required. The admin key for the backend API.
@@ -11,6 +12,7 @@ Environment variables:
 """
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 import sys
@@ -20,6 +22,7 @@ from urllib.request import Request, urlopen
 
 BASE_URL = os.environ.get("BASE_URL", "http://47.93.151.131:10723").rstrip("/")
 ADMIN_KEY = os.environ.get("ADMIN_API_KEY", "")
+BATCH_SIZE = 10000  # server-side maximum per request
 
 
 def api_post(path: str, payload: dict) -> dict:
@@ -35,7 +38,7 @@ def api_post(path: str, payload: dict) -> dict:
     )
     try:
         with urlopen(req) as resp:
-            return json.loads(resp.read())
+            return json.load(resp)
     except HTTPError as e:
         body = e.read().decode("utf-8", errors="replace")
         print(f"Error: HTTP {e.code} - {body}", file=sys.stderr)
@@ -46,34 +49,44 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Generate invite codes via admin API")
     parser.add_argument("--count", type=int, default=1000, help="Number of codes to generate (default: 1000)")
     parser.add_argument("--output", "-o", type=str, help="Write codes to file (one per line)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel API requests (default: 8)")
     args = parser.parse_args()
 
-    # The API supports batch generation; generate in chunks of 500
-    all_codes: list[str] = []
-    remaining = args.count
-    batch_size = 500
-
-    while remaining > 0:
-        n = min(remaining, batch_size)
-        print(f"Generating {n} codes ({len(all_codes)}/{args.count} done)...")
-        result = api_post("/v1/admin/invite-codes/generate", {"count": n})
-        codes = result.get("codes", [])
-        all_codes.extend(codes)
-        remaining -= len(codes)
+    if not ADMIN_KEY:
+        print("Error: ADMIN_API_KEY environment variable is required", file=sys.stderr)
+        sys.exit(1)
+
+    # The API generates up to 10000 codes per request; larger counts fan out in parallel
+    batches = [BATCH_SIZE] * (args.count // BATCH_SIZE)
+    if args.count % BATCH_SIZE:
+        batches.append(args.count % BATCH_SIZE)
+    print(
+        f"Generating {args.count} codes in {len(batches)} batch(es), {args.concurrency} at a time...",
+        file=sys.stderr,
+    )
+
+    def generate_batch(n: int) -> list[str]:
+        codes = api_post("/v1/admin/invite-codes/generate", {"count": n}).get("codes", [])
         if len(codes) < n:
             print(f"Warning: requested {n} but got {len(codes)}", file=sys.stderr)
-            break
+        return codes
 
-    print(f"\nGenerated {len(all_codes)} invite codes.")
+    # Codes are written as each batch arrives, so memory stays O(batch) for any --count.
+    generated = 0
+    out = open(args.output, "w", buffering=1024 * 1024) if args.output else sys.stdout
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            for codes in pool.map(generate_batch, batches):
+                if codes:
+                    out.write("\n".join(codes) + "\n")
+                generated += len(codes)
+    finally:
+        if out is not sys.stdout:
+            out.close()
 
+    print(f"\nGenerated {generated} invite codes.", file=sys.stderr)
     if args.output:
-        with open(args.output, "w") as f:
-            for code in all_codes:
-                f.write(code + "\n")
-        print(f"Saved to {args.output}")
-    else:
-        for code in all_codes:
-            print(code)
+        print(f"Saved to {args.output}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -15,6 +15,7 @@ Environment variables:
 import argparse
 import json
 import os
+import shutil
 import sys
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError
@@ -31,7 +32,7 @@ def api_get(path: str) -> dict:
     req = Request(f"{BASE_URL}{path}", headers={"X-Admin-Key": ADMIN_KEY})
     try:
         with urlopen(req) as resp:
-            return json.loads(resp.read())
+            return json.load(resp)
     except HTTPError as e:
         body = e.read().decode("utf-8", errors="replace")
         print(f"Error: HTTP {e.code} - {body}", file=sys.stderr)
@@ -40,10 +41,8 @@ def api_get(path: str) -> dict:
 
 def download_file(url: str, dest: str) -> None:
     req = Request(url)
-    with urlopen(req) as resp:
-        with open(dest, "wb") as f:
-            while chunk := resp.read(8192):
-                f.write(chunk)
+    with urlopen(req) as resp, open(dest, "wb") as f:
+        shutil.copyfileobj(resp, f, length=1024 * 1024)
 
 
 def cmd_get(bug_id: str, do_download: bool) -> None:
@@ -0,0 +1,52 @@
+import hashlib
+import itertools
+import os
+import secrets
+from typing import Any
+
+import httpx
+import pytest
+
+# Module-level ``pytestmark`` for suites that need a running backend; skips at
+# collection time instead of inside every test.
+INTEGRATION = [
+    pytest.mark.integration,
+    pytest.mark.skipif(os.getenv("RUN_INTEGRATION") != "1", reason="Set RUN_INTEGRATION=1 to execute integration tests"),
+]
+
+# Random per process (so per xdist worker and per run), then a plain counter.
+_ID_PREFIX = secrets.token_hex(3)
+_id_counter = itertools.count()
+
+
+def nid(n: int = 8) -> str:
+    """A unique hex id of at least ``n`` characters for test-owned names and versions."""
+    return f"{_ID_PREFIX}{next(_id_counter):0{max(n - len(_ID_PREFIX), 1)}x}"
+
+
+def sha256_hex(data: bytes) -> str:
+    """Hex sha256 of an in-memory buffer; test fixtures are not a security boundary."""
+    return hashlib.new("sha256", data, usedforsecurity=False).hexdigest()
+
+
+# Digest for publish-only releases; the API stores it without checking an artifact.
+SENTINEL_SHA256 = sha256_hex(b"test-sentinel")
+
+
+def expect(resp: httpx.Response, status: int = 200) -> Any:
+    """Assert the response status, naming the request on failure, and return the decoded body."""
+    assert resp.status_code == status, f"{resp.request.method} {resp.request.url.path} -> {resp.status_code}: {resp.text}"
+    return resp.json()
+
+
+def _without(value: Any, keys: tuple[str, ...]) -> Any:
+    if isinstance(value, dict):
+        return {k: _without(v, keys) for k, v in value.items() if k not in keys}
+    if isinstance(value, list):
+        return [_without(v, keys) for v in value]
+    return value
+
+
+def assert_matches(actual: Any, expected: Any, *, ignore: tuple[str, ...] = ("created_at", "updated_at")) -> None:
+    """Compare a decoded response to ``expected`` in one go, dropping server-generated timestamps at every level."""
+    assert _without(actual, ignore) == expected
@@ -1,12 +1,76 @@
+import hashlib
 import os
+import queue
+import secrets
+import socket
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 import pytest
 from httpx import Client
 
+from _helpers import SENTINEL_SHA256, nid
+
 
 RUN_INTEGRATION = os.getenv("RUN_INTEGRATION") == "1"
 BASE_URL = os.getenv("BASE_URL", "http://localhost:10723")
 
+_FRESH_USER_COUNTS = pytest.StashKey[Counter]()
+
+
+def pytest_configure(config):
+    # Bundle checks hash every artifact; the builtin fallback is several times slower.
+    if hashlib.sha256.__module__ != "_hashlib":
+        config.issue_config_time_warning(
+            pytest.PytestConfigWarning("hashlib is not OpenSSL-backed; sha256 checks will run slowly"),
+            stacklevel=2,
+        )
+
+
+def pytest_sessionstart(session):
+    # Fail fast when the backend is down instead of once per test at the client
+    # timeout. xdist workers skip this; the controller has already probed.
+    if not RUN_INTEGRATION or hasattr(session.config, "workerinput"):
+        return
+    url = urlsplit(BASE_URL)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    try:
+        socket.create_connection((url.hostname, port), timeout=2).close()
+    except OSError as exc:
+        pytest.exit(f"BASE_URL {BASE_URL} is unreachable: {exc}", returncode=pytest.ExitCode.USAGE_ERROR)
+
+
+def pytest_collection_modifyitems(config, items):
+    # Size each module's user pool to its tests that need their own identity.
+    config.stash[_FRESH_USER_COUNTS] = Counter(item.path for item in items if "user_headers" in item.fixturenames)
+
+
+def _register_user(client: Client, worker_id: str) -> dict[str, str]:
+    email = f"tester_{worker_id}_{nid(8)}@example.com"
+    password = f"Pwd-{secrets.token_hex(5)}"
+    device_id = f"dev-{nid(8)}"
+
+    code_resp = client.post("/v1/auth/request-email-code", json={"email": email, "purpose": "register"})
+    assert code_resp.status_code == 200, code_resp.text
+    code = code_resp.json().get("dev_code")
+    if not code:
+        pytest.skip("No dev_code available; run tests in development mode")
+
+    register_resp = client.post(
+        "/v1/auth/register",
+        json={
+            "email": email,
+            "verification_code": code,
+            "password": password,
+            "display_name": "Integration Tester",
+            "device_id": device_id,
+        },
+    )
+    assert register_resp.status_code == 201, register_resp.text
+    token = register_resp.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
 
 @pytest.fixture(scope="session")
 def base_url() -> str:
@@ -22,3 +86,92 @@ def client(base_url: str):
 @pytest.fixture(scope="session")
 def integration_enabled() -> bool:
     return RUN_INTEGRATION
+
+
+@pytest.fixture(scope="session")
+def admin_headers() -> dict[str, str]:
+    key = os.getenv("ADMIN_API_KEY", "")
+    if not key:
+        pytest.skip("Set ADMIN_API_KEY to run admin integration tests")
+    return {"X-Admin-Key": key}
+
+
+@pytest.fixture(scope="session")
+def bundle_factory(client, admin_headers: dict[str, str]):
+    """Publish a bundle release once per (bundle_type, scope_id, version) and return the created record.
+
+    Fields not given default to a CDN artifact URL, the sentinel digest, and a
+    mandatory release with an empty manifest.
+    """
+    published: dict[tuple[str, str, str], dict] = {}
+
+    def publish(*, bundle_type: str, scope_id: str, version: str, **fields) -> dict:
+        key = (bundle_type, scope_id, version)
+        if key not in published:
+            payload = {
+                "bundle_type": bundle_type,
+                "scope_id": scope_id,
+                "version": version,
+                "artifact_url": f"https://cdn.example.com/bundles/{bundle_type}/{scope_id}/{version}/bundle.tar.gz",
+                "sha256": SENTINEL_SHA256,
+                "size_bytes": 12345,
+                "is_mandatory": True,
+                "manifest_json": {},
+                **fields,
+            }
+            resp = client.post("/v1/admin/bundles/publish", json=payload, headers=admin_headers)
+            assert resp.status_code == 201, resp.text
+            published[key] = resp.json()
+        return published[key]
+
+    return publish
+
+
+@pytest.fixture(scope="module")
+def user_headers_pool(request, client, integration_enabled: bool, worker_id: str) -> queue.Queue:
+    """Users registered on first use in a module, one per test there that requests ``user_headers``."""
+    if not integration_enabled:
+        pytest.skip("Set RUN_INTEGRATION=1 to execute integration tests")
+    pool: queue.Queue = queue.Queue()
+    for _ in range(request.config.stash[_FRESH_USER_COUNTS][request.path]):
+        pool.put(_register_user(client, worker_id))
+    return pool
+
+
+@pytest.fixture
+def user_headers(user_headers_pool: queue.Queue, client, worker_id: str) -> dict[str, str]:
+    """Auth headers for a user no other test has touched."""
+    try:
+        return user_headers_pool.get_nowait()
+    except queue.Empty:
+        return _register_user(client, worker_id)
+
+
+@pytest.fixture(scope="session")
+def shared_user_headers(client, integration_enabled: bool, worker_id: str) -> dict[str, str]:
+    """Auth headers for one user per worker, shared by tests that do not depend on account state."""
+    if not integration_enabled:
+        pytest.skip("Set RUN_INTEGRATION=1 to execute integration tests")
+    return _register_user(client, worker_id)
+
+
+@pytest.fixture(scope="module")
+def module_user_pair(client, integration_enabled: bool, worker_id: str) -> tuple[dict[str, str], dict[str, str]]:
+    """Two users owned by one test module, registered concurrently."""
+    if not integration_enabled:
+        pytest.skip("Set RUN_INTEGRATION=1 to execute integration tests")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first, second = (pool.submit(_register_user, client, worker_id) for _ in range(2))
+        return first.result(), second.result()
+
+
+@pytest.fixture(scope="module")
+def module_user_headers(module_user_pair) -> dict[str, str]:
+    """Auth headers for a user owned by one test module; its tests build on each other's state."""
+    return module_user_pair[0]
+
+
+@pytest.fixture(scope="module")
+def other_user_headers(module_user_pair) -> dict[str, str]:
+    """The module's second user, for access-control checks against ``module_user_headers``."""
+    return module_user_pair[1]
@@ -1,57 +1,14 @@
-import hashlib
-import os
-from uuid import uuid4
-
 import pytest
 
+from _helpers import INTEGRATION, nid
 
-ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "")
-
-
-def _require_integration(integration_enabled: bool) -> None:
-    if not integration_enabled:
-        pytest.skip("Set RUN_INTEGRATION=1 to execute integration tests")
-
-
-def _admin_headers() -> dict[str, str]:
-    if not ADMIN_API_KEY:
-        pytest.skip("Set ADMIN_API_KEY to run admin course integration tests")
-    return {"X-Admin-Key": ADMIN_API_KEY}
-
-
-def _register_and_login(client):
-    email = f"admin_course_{uuid4().hex[:8]}@example.com"
-    password = f"Pwd-{uuid4().hex[:10]}"
-    device_id = f"dev-{uuid4().hex[:8]}"
-
-    code_resp = client.post("/v1/auth/request-email-code", json={"email": email, "purpose": "register"})
-    assert code_resp.status_code == 200, code_resp.text
-    code = code_resp.json().get("dev_code")
-    if not code:
-        pytest.skip("No dev_code available; run tests in development mode")
-
-    register_resp = client.post(
-        "/v1/auth/register",
-        json={
-            "email": email,
-            "verification_code": code,
-            "password": password,
-            "display_name": "Admin Course Tester",
-            "device_id": device_id,
-        },
-    )
-    assert register_resp.status_code == 201, register_resp.text
-    token = register_resp.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+pytestmark = INTEGRATION
 
 
-@pytest.mark.integration
-def test_chapters_visible_only_after_bundle_and_intro_updates(client, integration_enabled: bool):
-    _require_integration(integration_enabled)
-    admin_headers = _admin_headers()
-    user_headers = _register_and_login(client)
-
-    course_code = f"CS{uuid4().hex[:6]}".upper()
+def test_chapters_visible_only_after_bundle_and_intro_updates(
+    client, admin_headers, user_headers, worker_id: str, bundle_factory
+):
+    course_code = f"CS{worker_id}{nid(6)}".upper()
     create_course_resp = client.post(
         "/v1/admin/courses",
         headers=admin_headers,
@@ -88,23 +45,15 @@ def test_chapters_visible_only_after_bundle_and_intro_updates(client, integratio
     assert chapters_before_bundle.status_code == 200, chapters_before_bundle.text
     assert chapters_before_bundle.json()["chapters"] == []
 
-    publish_version = f"1.0.{uuid4().hex[:4]}"
+    publish_version = f"1.0.{nid(4)}"
     chapter_scope = f"{course_id}/ch1_foundation"
-    publish_resp = client.post(
-        "/v1/admin/bundles/publish",
-        headers=admin_headers,
-        json={
-            "bundle_type": "chapter",
-            "scope_id": chapter_scope,
-            "version": publish_version,
-            "artifact_url": f"https://cdn.example.com/bundles/chapter/{chapter_scope}/{publish_version}/bundle.tar.gz",
-            "sha256": hashlib.sha256(chapter_scope.encode("utf-8")).hexdigest(),
-            "size_bytes": 87654,
-            "is_mandatory": True,
-            "manifest_json": {"required_experts": []},
-        },
+    bundle_factory(
+        bundle_type="chapter",
+        scope_id=chapter_scope,
+        version=publish_version,
+        size_bytes=87654,
+        manifest_json={"required_experts": []},
     )
-    assert publish_resp.status_code == 201, publish_resp.text
 
     chapters_after_bundle = client.get(f"/v1/courses/{course_id}/chapters", headers=user_headers)
     assert chapters_after_bundle.status_code == 200, chapters_after_bundle.text
@@ -0,0 +1,25 @@
+import re
+
+from _helpers import INTEGRATION, expect
+
+pytestmark = INTEGRATION
+
+CODE_RE = re.compile(r"^[A-Z0-9]{8}$")
+
+
+def test_admin_generate_invite_codes(client, admin_headers):
+    resp = client.post("/v1/admin/invite-codes/generate", json={"count": 25}, headers=admin_headers)
+    payload = expect(resp, 201)
+    assert payload["count"] == 25
+    assert len(payload["codes"]) == 25
+    assert len(set(payload["codes"])) == 25
+    assert all(CODE_RE.match(code) for code in payload["codes"]), payload["codes"]
+
+    resp = client.get("/v1/admin/invite-codes", params={"unused_only": True, "limit": 1000}, headers=admin_headers)
+    listed = {item["code"] for item in expect(resp)["codes"]}
+    assert set(payload["codes"]) <= listed
+
+
+def test_user_generate_invite_code(client, shared_user_headers):
+    resp = client.post("/v1/invite-codes/generate", headers=shared_user_headers)
+    assert CODE_RE.match(expect(resp, 201)["code"])
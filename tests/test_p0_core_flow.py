@@ -1,17 +1,17 @@
+import secrets
 from datetime import datetime, timezone
-from uuid import uuid4
 
 import pytest
 
+from _helpers import INTEGRATION, nid
 
-@pytest.mark.integration
-def test_p0_core_flow(client, integration_enabled: bool):
-    if not integration_enabled:
-        pytest.skip("Set RUN_INTEGRATION=1 to execute integration tests")
+pytestmark = INTEGRATION
 
-    email = f"student_{uuid4().hex[:8]}@example.com"
-    password = f"Pwd-{uuid4().hex[:10]}"
-    device_id = f"dev-{uuid4().hex[:8]}"
+
+def test_p0_core_flow(client):
+    email = f"student_{nid(8)}@example.com"
+    password = f"Pwd-{secrets.token_hex(5)}"
+    device_id = f"dev-{nid(8)}"
 
     # 1) request register code
     resp = client.post(
@@ -95,7 +95,7 @@ def test_p0_core_flow(client, integration_enabled: bool):
         json={
             "course_id": course_id,
             "chapter_id": chapter_code,
-            "session_id": f"sess_{uuid4().hex[:8]}",
+            "session_id": f"sess_{nid(8)}",
             "status": "IN_PROGRESS",
             "task_snapshot": {"current_task": "intro", "completed": []},
         },
@@ -110,12 +110,12 @@ def test_p0_core_flow(client, integration_enabled: bool):
         json={
             "events": [
                 {
-                    "event_id": f"evt_{uuid4().hex[:12]}",
+                    "event_id": f"evt_{nid(12)}",
                     "event_type": "turn_completed",
                     "event_time": datetime.now(timezone.utc).isoformat(),
                     "course_id": course_id,
                     "chapter_id": chapter_code,
-                    "session_id": f"sess_{uuid4().hex[:8]}",
+                    "session_id": f"sess_{nid(8)}",
                     "payload": {"turn": 1},
                 }
             ]
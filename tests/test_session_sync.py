@@ -1,156 +1,171 @@
 """Integration tests for cross-device session sync endpoints (Task 12 smoke test).
 
+The tests share one user, chapter and session per module and run in file
+order: the recovery fetch reads back what the turn, memory and report tests
+wrote.
+
 Run with:
     RUN_INTEGRATION=1 BASE_URL=http://<server>:10723 uv run pytest -q tests/test_session_sync.py
 """
 
-from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
+from _helpers import INTEGRATION, assert_matches, expect, nid
 
-@pytest.mark.integration
-def test_session_sync_flow(client, integration_enabled: bool):
-    if not integration_enabled:
-        pytest.skip("Set RUN_INTEGRATION=1 to execute integration tests")
-
-    email = f"sync_test_{uuid4().hex[:8]}@example.com"
-    password = f"Pwd-{uuid4().hex[:10]}"
-    device_id = f"dev-{uuid4().hex[:8]}"
+pytestmark = INTEGRATION
 
-    # ── Register ──────────────────────────────────────────────────────────────
+MEMORY = {"memo_digest": {"topics_covered": ["pandas intro"]}, "memory_state": {}}
+MEMORY_UPDATED = {"memo_digest": {"topics_covered": ["pandas intro", "dataframe"]}, "memory_state": {}}
+REPORT_MD = "# Dynamic Report\n\n**Progress:** Student understands pandas basics."
+TURNS = [
+    {
+        "turn_index": 0,
+        "user_message": "Hello, what is pandas?",
+        "companion_response": "Pandas is a data analysis library for Python.",
+        "turn_outcome": {"understood": True},
+    },
+    {
+        "turn_index": 1,
+        "user_message": "Show me an example.",
+        "companion_response": "Sure! `import pandas as pd`",
+        "turn_outcome": {},
+    },
+]
 
-    resp = client.post(
-        "/v1/auth/request-email-code",
-        json={"email": email, "purpose": "register"},
-    )
-    assert resp.status_code == 200, resp.text
-    dev_code = resp.json().get("dev_code")
-    if not dev_code:
-        pytest.skip("No dev_code; run in development environment")
 
-    resp = client.post(
-        "/v1/auth/register",
-        json={
-            "email": email,
-            "verification_code": dev_code,
-            "password": password,
-            "display_name": "Sync Tester",
-            "device_id": device_id,
-        },
-    )
-    assert resp.status_code == 201, resp.text
-    access_token = resp.json()["access_token"]
-    headers = {"Authorization": f"Bearer {access_token}"}
+@pytest.fixture(scope="module")
+def chapter_id() -> str:
+    return f"test_chapter_{nid(8)}"
 
-    chapter_id = f"test_chapter_{uuid4().hex[:8]}"
-
-    # ── 1. Session registration ────────────────────────────────────────────────
 
+@pytest.fixture(scope="module")
+def created_session(client, module_user_headers: dict[str, str], chapter_id: str) -> dict:
     resp = client.post(
         f"/v1/chapters/{chapter_id}/sessions",
         json={"course_id": None},
-        headers=headers,
+        headers=module_user_headers,
     )
-    assert resp.status_code == 201, resp.text
-    data = resp.json()
-    assert "session_id" in data
-    assert "created_at" in data
-    session_id = data["session_id"]
-    assert len(session_id) > 0
+    return expect(resp, 201)
 
-    # ── 2. Turn append (idempotent) ────────────────────────────────────────────
 
-    turn_payload = {
-        "chapter_id": chapter_id,
-        "turn_index": 0,
-        "user_message": "Hello, what is pandas?",
-        "companion_response": "Pandas is a data analysis library for Python.",
-        "turn_outcome": {"understood": True},
-    }
-    resp = client.post(f"/v1/sessions/{session_id}/turns", json=turn_payload, headers=headers)
-    assert resp.status_code == 201, resp.text
-    assert resp.json()["accepted"] is True
+@pytest.fixture(scope="module")
+def session_id(created_session: dict) -> str:
+    return created_session["session_id"]
+
+
+def test_session_register(created_session: dict):
+    assert "session_id" in created_session
+    assert "created_at" in created_session
+    assert len(created_session["session_id"]) > 0
 
-    # Idempotency: posting same turn_index again must not raise an error
-    resp = client.post(f"/v1/sessions/{session_id}/turns", json=turn_payload, headers=headers)
-    assert resp.status_code == 201, resp.text
-    assert resp.json()["accepted"] is True
+
+def test_turn_idempotent(client, module_user_headers: dict[str, str], chapter_id: str, session_id: str):
+    headers = module_user_headers
+    turn_payload = {"chapter_id": chapter_id, **TURNS[0]}
+    # Idempotency: the same turn_index posted twice at once (a retry racing the
+    # original) must be accepted both times and stored once.
+    url = f"/v1/sessions/{session_id}/turns"
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        retry = pool.submit(client.post, url, json=turn_payload, headers=headers)
+        resp = client.post(url, json=turn_payload, headers=headers)
+        retry_resp = retry.result()
+    assert expect(resp, 201)["accepted"] is True
+    assert expect(retry_resp, 201)["accepted"] is True
 
     # Second turn
-    resp = client.post(
-        f"/v1/sessions/{session_id}/turns",
-        json={
-            "chapter_id": chapter_id,
-            "turn_index": 1,
-            "user_message": "Show me an example.",
-            "companion_response": "Sure! `import pandas as pd`",
-            "turn_outcome": {},
-        },
-        headers=headers,
-    )
-    assert resp.status_code == 201, resp.text
+    resp = client.post(url, json={"chapter_id": chapter_id, **TURNS[1]}, headers=headers)
+    expect(resp, 201)
 
-    # ── 3. Memory upsert ───────────────────────────────────────────────────────
 
-    memory = {"memo_digest": {"topics_covered": ["pandas intro"]}, "memory_state": {}}
+def test_memory_upsert(client, module_user_headers: dict[str, str], chapter_id: str, session_id: str):
+    headers = module_user_headers
     resp = client.put(
         f"/v1/sessions/{session_id}/memory",
-        json={"chapter_id": chapter_id, "memory_json": memory},
+        json={"chapter_id": chapter_id, "memory_json": MEMORY},
         headers=headers,
     )
-    assert resp.status_code == 200, resp.text
-    assert resp.json()["accepted"] is True
+    assert expect(resp)["accepted"] is True
 
     # Upsert again (update path)
-    memory2 = {"memo_digest": {"topics_covered": ["pandas intro", "dataframe"]}, "memory_state": {}}
     resp = client.put(
         f"/v1/sessions/{session_id}/memory",
-        json={"chapter_id": chapter_id, "memory_json": memory2},
+        json={"chapter_id": chapter_id, "memory_json": MEMORY_UPDATED},
         headers=headers,
     )
-    assert resp.status_code == 200, resp.text
+    expect(resp)
 
-    # ── 4. Report upsert ───────────────────────────────────────────────────────
 
-    report_md = "# Dynamic Report\n\n**Progress:** Student understands pandas basics."
+def test_report_upsert(client, module_user_headers: dict[str, str], chapter_id: str, session_id: str):
+    headers = module_user_headers
     resp = client.put(
         f"/v1/sessions/{session_id}/report",
-        json={"chapter_id": chapter_id, "report_md": report_md},
+        json={"chapter_id": chapter_id, "report_md": REPORT_MD},
         headers=headers,
     )
-    assert resp.status_code == 200, resp.text
-    assert resp.json()["accepted"] is True
+    assert expect(resp)["accepted"] is True
 
     # Upsert again (update path)
     resp = client.put(
         f"/v1/sessions/{session_id}/report",
-        json={"chapter_id": chapter_id, "report_md": report_md + "\n\nUpdated."},
+        json={"chapter_id": chapter_id, "report_md": REPORT_MD + "\n\nUpdated."},
         headers=headers,
     )
-    assert resp.status_code == 200, resp.text
-
-    # ── 5. Recovery fetch ──────────────────────────────────────────────────────
-
-    resp = client.get(f"/v1/chapters/{chapter_id}/session-state", headers=headers)
-    assert resp.status_code == 200, resp.text
-    state = resp.json()
-    assert state["has_data"] is True
-    assert state["session_id"] == session_id
-    assert len(state["turns"]) == 2
-    assert state["turns"][0]["turn_index"] == 0
-    assert state["turns"][0]["user_message"] == "Hello, what is pandas?"
-    assert state["turns"][1]["turn_index"] == 1
-    assert state["memory"] == memory2
-    assert "Updated." in state["report_md"]
+    expect(resp)
+
+
+def test_recovery_fetch(client, module_user_headers: dict[str, str], chapter_id: str, session_id: str):
+    headers = module_user_headers
+    # The two reads are independent; the shared httpx client is thread-safe.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        unknown = pool.submit(client.get, "/v1/chapters/nonexistent_chapter_xyz/session-state", headers=headers)
+        resp = client.get(f"/v1/chapters/{chapter_id}/session-state", headers=headers)
+        unknown_resp = unknown.result()
+
+    assert_matches(
+        expect(resp),
+        {
+            "has_data": True,
+            "session_id": session_id,
+            "turns": TURNS,
+            "memory": MEMORY_UPDATED,
+            "report_md": REPORT_MD + "\n\nUpdated.",
+            "agent_state": None,
+        },
+    )
 
     # Unknown chapter → has_data: false
-    resp = client.get(f"/v1/chapters/nonexistent_chapter_xyz/session-state", headers=headers)
-    assert resp.status_code == 200, resp.text
-    assert resp.json()["has_data"] is False
+    assert expect(unknown_resp)["has_data"] is False
+
+
+def test_bulk_sync(client, module_user_headers: dict[str, str], chapter_id: str):
+    headers = module_user_headers
+    # A chapter of its own, so the chapter-level recovery fetch above is unaffected.
+    bulk_chapter_id = f"{chapter_id}_bulk"
+    resp = client.post(f"/v1/chapters/{bulk_chapter_id}/sessions", json={"course_id": None}, headers=headers)
+    bulk_session_id = expect(resp, 201)["session_id"]
+
+    turn = {"chapter_id": bulk_chapter_id, "user_message": "Hi", "companion_response": "Hello!", "turn_outcome": {}}
+    payload = {
+        "turns": [{**turn, "turn_index": 0}, {**turn, "turn_index": 0}, {**turn, "turn_index": 1}],
+        "memory": {"chapter_id": bulk_chapter_id, "memory_json": MEMORY},
+        "report": {"chapter_id": bulk_chapter_id, "report_md": REPORT_MD},
+    }
+    # Replaying the same batch is a no-op for turns and a plain update for memory/report
+    for _ in range(2):
+        resp = client.post(f"/v1/sessions/{bulk_session_id}/bulk-sync", json=payload, headers=headers)
+        assert expect(resp)["accepted"] is True
+
+    resp = client.get(f"/v1/sessions/{bulk_session_id}/state", headers=headers)
+    state = expect(resp)
+    assert [t["turn_index"] for t in state["turns"]] == [0, 1]
+    assert state["memory"] == MEMORY
+    assert state["report_md"] == REPORT_MD
 
-    # ── 6. Workspace file submit (upload-url + confirm + list) ─────────────────
 
+def test_workspace_submit(client, module_user_headers: dict[str, str], chapter_id: str, session_id: str):
+    headers = module_user_headers
     fake_size = 1024  # 1 KB
     resp = client.post(
         "/v1/storage/workspace/upload-url",
@@ -158,8 +173,7 @@ def test_session_sync_flow(client, integration_enabled: bool):
         headers=headers,
     )
     # May be 200 (OSS disabled → dev fallback) or 200 with real presigned URL
-    assert resp.status_code == 200, resp.text
-    url_data = resp.json()
+    url_data = expect(resp)
     assert "presigned_url" in url_data
     assert "oss_key" in url_data
     oss_key = url_data["oss_key"]
@@ -177,8 +191,7 @@ def test_session_sync_flow(client, integration_enabled: bool):
         },
         headers=headers,
     )
-    assert resp.status_code == 201, resp.text
-    quota = resp.json()
+    quota = expect(resp, 201)
     assert quota["quota_used_bytes"] >= fake_size
     assert quota["quota_limit_bytes"] == 100 * 1024 * 1024
 
@@ -194,53 +207,28 @@ def test_session_sync_flow(client, integration_enabled: bool):
         },
         headers=headers,
     )
-    assert resp.status_code == 409, resp.text
-    assert resp.json()["error"]["code"] == "QUOTA_EXCEEDED"
+    assert expect(resp, 409)["error"]["code"] == "QUOTA_EXCEEDED"
 
     # List files
     resp = client.get("/v1/storage/workspace/files", headers=headers)
-    assert resp.status_code == 200, resp.text
-    files_data = resp.json()
+    files_data = expect(resp)
     assert "files" in files_data
     assert len(files_data["files"]) >= 1
     filenames = [f["filename"] for f in files_data["files"]]
     assert "solution.py" in filenames
 
-    # ── 7. Access control: wrong user cannot access session ────────────────────
 
-    # Register a second user
-    email2 = f"sync_other_{uuid4().hex[:8]}@example.com"
+def test_access_control(client, other_user_headers: dict[str, str], chapter_id: str, session_id: str):
+    # Should get 403 or 404 when accessing another user's session
     resp = client.post(
-        "/v1/auth/request-email-code",
-        json={"email": email2, "purpose": "register"},
+        f"/v1/sessions/{session_id}/turns",
+        json={
+            "chapter_id": chapter_id,
+            "turn_index": 99,
+            "user_message": "unauthorized",
+            "companion_response": "should fail",
+            "turn_outcome": {},
+        },
+        headers=other_user_headers,
     )
-    assert resp.status_code == 200
-    dev_code2 = resp.json().get("dev_code")
-    if dev_code2:
-        resp = client.post(
-            "/v1/auth/register",
-            json={
-                "email": email2,
-                "verification_code": dev_code2,
-                "password": f"Pwd-{uuid4().hex[:10]}",
-                "display_name": "Other User",
-                "device_id": f"dev-{uuid4().hex[:8]}",
-            },
-        )
-        if resp.status_code == 201:
-            other_token = resp.json()["access_token"]
-            other_headers = {"Authorization": f"Bearer {other_token}"}
-
-            # Should get 403 or 404 when accessing another user's session
-            resp = client.post(
-                f"/v1/sessions/{session_id}/turns",
-                json={
-                    "chapter_id": chapter_id,
-                    "turn_index": 99,
-                    "user_message": "unauthorized",
-                    "companion_response": "should fail",
-                    "turn_outcome": {},
-                },
-                headers=other_headers,
-            )
-            assert resp.status_code in (403, 404), f"Expected 403/404 but got {resp.status_code}"
+    assert resp.status_code in (403, 404), f"Expected 403/404 but got {resp.status_code}"